@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+
+from augment_cleaner_v2 import AugmentCleanerV2
+from augment_results_store import ResultsStore
+from augment_scan_budget import ScanBudget
+
+
+def default_state_path():
+    """Progress file for background scans, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'background_scan.json')
+
+
+def lower_process_priority():
+    """Drop this process to background CPU/IO priority where the OS allows"""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            # Background mode lowers CPU, I/O and memory priority together
+            PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetPriorityClass(kernel32.GetCurrentProcess(),
+                                                  PROCESS_MODE_BACKGROUND_BEGIN))
+        os.nice(10)
+        return True
+    except Exception:
+        return False
+
+
+class TokenBucket:
+    """Token bucket refilled at a fixed rate per second"""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def take(self, amount):
+        """Take tokens, returning how many seconds to wait before proceeding
+
+        The bucket may go into debt so a single unit larger than the
+        capacity (a big log file) is still allowed, just paid for later.
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class IOThrottle:
+    """Caps scanner I/O to a number of bytes and files per second"""
+
+    def __init__(self, bytes_per_sec=None, files_per_sec=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.byte_bucket = TokenBucket(bytes_per_sec, clock=clock) if bytes_per_sec else None
+        self.file_bucket = TokenBucket(files_per_sec, clock=clock) if files_per_sec else None
+        self.sleep = sleep
+        self.throttled_seconds = 0.0
+
+    def consume(self, files=0, nbytes=0):
+        """Account for I/O, sleeping until both buckets allow it"""
+        delay = 0.0
+        if self.byte_bucket and nbytes:
+            delay = max(delay, self.byte_bucket.take(nbytes))
+        if self.file_bucket and files:
+            delay = max(delay, self.file_bucket.take(files))
+
+        if delay > 0:
+            self.throttled_seconds += delay
+            self.sleep(delay)
+
+
+class BackgroundScanScheduler:
+    """Runs AugmentCleanerV2 scans in small, throttled slices
+
+    Each call to tick() scans until its time slice is used up, saving the
+    findings and phase cursors after every phase so the next tick (possibly
+    in a new process) carries on from there. Once a full scan completes, the next
+    one starts after `interval` seconds. Each tick records its results
+    through a store from `results_factory` (None turns history off). The
+    clock and sleep functions are injectable so the scheduler can be
+    driven by a fake clock.
+    """
+
+    def __init__(self, state_path=None, interval=3600, tick_budget=30,
+                 bytes_per_sec=2 * 1024 * 1024, files_per_sec=200, unit_pause=0.1,
+                 cleaner_factory=AugmentCleanerV2, results_factory=ResultsStore,
+                 clock=time.time, sleep=time.sleep):
+        self.state_path = state_path or default_state_path()
+        self.interval = interval
+        self.tick_budget = tick_budget
+        self.unit_pause = unit_pause
+        self.cleaner_factory = cleaner_factory
+        self.results_factory = results_factory
+        self.clock = clock
+        self.sleep = sleep
+        self.throttle = IOThrottle(bytes_per_sec, files_per_sec, clock=clock, sleep=sleep)
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'cycle': None, 'last_completed': None, 'last_findings': None}
+
+    def save_state(self, state):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def is_due(self, state):
+        """True when a scan is in progress or the interval has elapsed"""
+        if state['cycle'] is not None or state['last_completed'] is None:
+            return True
+        return self.clock() - state['last_completed'] >= self.interval
+
+    def tick(self):
+        """Run one time slice of the background scan
+
+        Returns True when this tick finished a full scan.
+        """
+        state = self.load_state()
+        if not self.is_due(state):
+            return False
+
+        results = self.results_factory() if self.results_factory else None
+        try:
+            return self.run_tick(state, results)
+        finally:
+            if results:
+                results.close()
+
+    def run_tick(self, state, results):
+        """Scan one slice of the current cycle, recording into `results`"""
+        cleaner = self.cleaner_factory()
+        cleaner.io_throttle = self.throttle
+        cleaner.scan_budget = ScanBudget(total_seconds=self.tick_budget, clock=self.clock)
+        cleaner.results = results
+
+        if state['cycle'] is None:
+            state['cycle'] = {'started': self.clock(), 'phase_status': {},
+                              'findings': cleaner.findings}
+        cycle = state['cycle']
+        cleaner.findings = cycle['findings']
+        cleaner.phase_status = cycle['phase_status']
+
+        def phase_done(name):
+            cycle['findings'] = cleaner.findings
+            self.save_state(state)
+            # Give the disk back to the IDE between work units
+            self.sleep(self.unit_pause)
+
+        if not cleaner.run_scan_phases(on_phase_done=phase_done):
+            self.save_state(state)
+            return False
+
+        state['cycle'] = None
+        state['last_completed'] = self.clock()
+        state['last_findings'] = cleaner.findings
+        self.save_state(state)
+        return True
+
+    def run_forever(self, poll_interval=60):
+        """Keep ticking until interrupted"""
+        lower_process_priority()
+        while True:
+            if self.tick():
+                findings = self.load_state()['last_findings']
+                total_items = sum(len(items) for items in findings.values())
+                print(f"🕒 Background scan complete: {total_items} item(s) found")
+            self.sleep(poll_interval)
+
+
+def main():
+    """Run the scanner as a scheduled, low-priority background job"""
+    scheduler = BackgroundScanScheduler()
+
+    if '--once' in sys.argv:
+        # One slice per invocation, for use from Task Scheduler
+        lower_process_priority()
+        scheduler.tick()
+    else:
+        print("🕒 Augment background scanner - press Ctrl+C to stop")
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n⚠️ Background scanner stopped. Progress has been saved.")
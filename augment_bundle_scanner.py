@@ -0,0 +1,128 @@
+import os
+import re
+import json
+import mmap
+
+# One pass over the raw bytes picks up URLs, quoted bare hostnames and
+# quoted identifiers that look like telemetry or identity fields.
+BUNDLE_PATTERN = re.compile(
+    rb"(?P<url>https?://(?P<url_host>[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9-]+)+)"
+    rb"(?::\d{1,5})?(?:/[A-Za-z0-9._~:/?#@!$&*+,;=%-]*)?)"
+    rb"|[\"'](?P<host>(?:[a-z0-9-]+\.)+(?:com|net|io|ai|dev|cloud|app|co))[\"']"
+    rb"|[\"'](?P<telemetry>(?:[A-Za-z_$][\w$.]*?)?(?:[Tt]elemetry|[Aa]nalytics|[Tt]racking|[Ff]ingerprint"
+    rb"|machineId|deviceId|sessionId|userId|userEmail|hostname|installationId)[\w$.]*)[\"']"
+)
+
+BUNDLE_EXTENSIONS = ('.js', '.mjs', '.cjs')
+
+# Files at or above this size are memory-mapped rather than read
+MMAP_THRESHOLD = 256 * 1024
+
+# Documentation and schema hosts that show up in most bundles
+COMMON_HOSTS = {
+    'www.w3.org', 'w3.org', 'github.com', 'reactjs.org', 'react.dev', 'nodejs.org',
+    'developer.mozilla.org', 'tools.ietf.org', 'datatracker.ietf.org', 'json-schema.org',
+    'example.com', 'www.example.com', 'localhost', 'go.microsoft.com', 'aka.ms',
+    'npmjs.com', 'www.npmjs.com', 'opensource.org', 'www.apache.org', 'mths.be',
+}
+
+
+def default_cache_path():
+    """Per-version bundle analysis cache, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'bundle_cache.json')
+
+
+def endpoint_hostnames(analysis):
+    """Hostnames from a bundle analysis, minus common documentation hosts"""
+    return [host for host in analysis['hostnames'] if host not in COMMON_HOSTS]
+
+
+class BundleScanner:
+    """Finds endpoints and telemetry fields shipped in extension JS bundles
+
+    Bundles are scanned as raw bytes (memory-mapped when large) with a
+    single compiled regex, so multi-megabyte files are never decoded into
+    Python strings. Results are cached by extension folder name, which
+    includes the version, so each version is only analysed once.
+    """
+
+    def __init__(self, cache_path=None, io_hook=None):
+        self.cache_path = cache_path or default_cache_path()
+        self.io_hook = io_hook
+        self.cache = None
+
+    def analyse_extension(self, ext_path, ext_name):
+        """Return the (possibly cached) analysis of one extension folder"""
+        if self.cache is None:
+            self.cache = self.load_cache()
+
+        if ext_name in self.cache:
+            return self.cache[ext_name]
+
+        urls, hostnames, telemetry_keys = set(), set(), set()
+        files_scanned = bytes_scanned = 0
+
+        for root, dirs, files in os.walk(ext_path):
+            dirs[:] = [d for d in dirs if d != 'node_modules']
+            for file in files:
+                if not file.endswith(BUNDLE_EXTENSIONS):
+                    continue
+                file_path = os.path.join(root, file)
+                try:
+                    size = os.path.getsize(file_path)
+                    if self.io_hook:
+                        self.io_hook(files=1, nbytes=size)
+                    self.scan_file(file_path, size, urls, hostnames, telemetry_keys)
+                except (OSError, ValueError):
+                    continue
+                files_scanned += 1
+                bytes_scanned += size
+
+        analysis = {
+            'urls': sorted(urls),
+            'hostnames': sorted(hostnames),
+            'telemetry_keys': sorted(telemetry_keys),
+            'files_scanned': files_scanned,
+            'bytes_scanned': bytes_scanned
+        }
+        self.cache[ext_name] = analysis
+        self.save_cache()
+        return analysis
+
+    def scan_file(self, file_path, size, urls, hostnames, telemetry_keys):
+        """Run the bundle pattern over one file's raw bytes"""
+        if size == 0:
+            return
+
+        with open(file_path, 'rb') as f:
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    self.collect_matches(data, urls, hostnames, telemetry_keys)
+            else:
+                self.collect_matches(f.read(), urls, hostnames, telemetry_keys)
+
+    def collect_matches(self, data, urls, hostnames, telemetry_keys):
+        for match in BUNDLE_PATTERN.finditer(data):
+            if match.group('url'):
+                urls.add(match.group('url').decode('ascii', errors='replace'))
+                hostnames.add(match.group('url_host').decode('ascii', errors='replace').lower())
+            elif match.group('host'):
+                hostnames.add(match.group('host').decode('ascii', errors='replace'))
+            else:
+                telemetry_keys.add(match.group('telemetry').decode('ascii', errors='replace'))
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(self.cache, f)
+        except OSError:
+            pass
@@ -5,12 +5,28 @@ import json
 import winreg
 import subprocess
 import sys
+import time
 from datetime import datetime
 
+from augment_bundle_scanner import BundleScanner, endpoint_hostnames
+from augment_db_index import ItemTableIndex
+from augment_ide_discovery import shared_discovery
+from augment_results_store import ResultsStore
+from augment_scan_budget import ScanBudget
+from augment_sqlite import ConnectionPool, write_transaction, DEFAULT_BUSY_TIMEOUT_MS
+
+# Phases that work from another phase's findings only run once it has completed
+PHASE_DEPENDENCIES = {
+    'ai_training_data': ('extensions',),
+    'extension_bundles': ('extensions',),
+    'network_traces': ('extension_bundles',)
+}
+
 class AugmentCleanerV2:
     """Enhanced cleaner for newer Augment versions (0.492.2+)"""
     
-    def __init__(self):
+    def __init__(self, use_index=False, index_dir=None, discovery=None,
+                 busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS, results=None):
         self.findings = {
             'extensions': [],
             'databases': [],
@@ -23,6 +39,19 @@ class AugmentCleanerV2:
         }
         self.cleaned_items = 0
         self.backup_dir = None
+        self.use_index = use_index
+        self.index_dir = index_dir
+        self.item_indexes = {}
+        self.io_throttle = None
+        self.io_counters = {'files': 0, 'bytes': 0}
+        self.discovery = discovery or shared_discovery()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.connections = ConnectionPool(busy_timeout_ms)
+        self.bundle_scanner = BundleScanner(io_hook=self.account_io)
+        self.scan_budget = None
+        self.phase_status = {}
+        self.forced_unit = False
+        self.results = results
     
     def scan_for_newer_augment(self):
         """Comprehensive scan for newer Augment versions and their data"""
@@ -35,89 +64,241 @@ class AugmentCleanerV2:
         os.makedirs(self.backup_dir, exist_ok=True)
         
         # Scan different areas
-        self.scan_extensions()
-        self.scan_databases_deep()
-        self.scan_personal_data()
-        self.scan_system_fingerprints()
-        self.scan_cloud_data()
-        self.scan_ai_training_data()
-        self.scan_registry_deep()
-        self.scan_network_traces()
+        self.run_scan_phases()
         
         return self.generate_findings_report()
     
+    def run_scan_phases(self, on_phase_done=None):
+        """Run every phase that is not yet complete, within the scan budget
+        
+        Phases cut short by the budget stay incomplete in phase_status with
+        a cursor, and are continued from there on the next call. Phases
+        listed in PHASE_DEPENDENCIES wait until their upstream phases have
+        completed. Returns True when every phase has completed.
+        """
+        if self.scan_budget:
+            self.scan_budget.start()
+        
+        try:
+            for name, scan in self.scan_phases():
+                status = self.phase_status.setdefault(name, {'complete': False, 'cursor': None})
+                if status['complete']:
+                    continue
+                if self.scan_budget and self.scan_budget.overall_exhausted():
+                    continue
+                if not all(self.phase_status.get(upstream, {}).get('complete')
+                           for upstream in PHASE_DEPENDENCIES.get(name, ())):
+                    continue
+                
+                if self.scan_budget:
+                    self.scan_budget.start_phase(name)
+                status['truncated'] = False
+                seen = {category: len(items) for category, items in self.findings.items()}
+                started = time.perf_counter()
+                scan()
+                self.record_phase(name, time.perf_counter() - started, seen)
+                if status.pop('truncated'):
+                    status['partial'] = True
+                else:
+                    self.phase_status[name] = {'complete': True, 'cursor': None}
+                
+                if on_phase_done:
+                    on_phase_done(name)
+        finally:
+            self.connections.close_all()
+            if self.results:
+                self.results.add_counter('io_files', self.io_counters['files'])
+                self.results.add_counter('io_bytes', self.io_counters['bytes'])
+                self.results.flush()
+        
+        return self.scan_complete()
+    
+    def record_phase(self, name, seconds, seen):
+        """Record a phase's timing and the findings it added since `seen` counts"""
+        if not self.results:
+            return
+        self.results.add_timing(name, seconds)
+        for category, items in self.findings.items():
+            for finding in items[seen.get(category, 0):]:
+                self.results.add_finding(category, finding, self.finding_version(finding))
+        self.results.flush()
+    
+    def finding_version(self, finding):
+        """Augment extension version a finding belongs to, when known"""
+        if finding.get('version'):
+            return finding['version']
+        if finding.get('extension'):
+            return self.extract_version(finding['extension'])
+        return None
+    
+    def record_cleaned(self, category, path, nbytes=None):
+        if self.results:
+            self.results.add_cleaned(category, path, nbytes)
+    
+    def scan_complete(self):
+        """True when every phase ran to completion"""
+        return all(self.phase_status.get(name, {}).get('complete') for name, _ in self.scan_phases())
+    
+    def budgeted_units(self, phase, units):
+        """Yield (cursor, unit) pairs until the scan budget runs out
+        
+        Units must come in ascending cursor order. Units at or before the
+        phase's saved cursor were handled by an earlier run and are skipped.
+        A phase cut short before always gets through at least one unit, so
+        repeated short runs keep making progress.
+        """
+        status = self.phase_status.setdefault(phase, {'complete': False, 'cursor': None})
+        resume = status['cursor']
+        self.forced_unit = bool(status.get('partial'))
+        for cursor, unit in units:
+            if resume is not None and cursor <= resume:
+                continue
+            if self.budget_exhausted():
+                status['truncated'] = True
+                print(f"   ⏱️ Time budget reached, {phase} scan is incomplete")
+                break
+            yield cursor, unit
+            status['cursor'] = cursor
+            self.forced_unit = False
+        self.forced_unit = False
+    
+    def budget_exhausted(self):
+        """True when the current unit of work should stop for the time budget"""
+        return bool(self.scan_budget) and not self.forced_unit and self.scan_budget.exhausted()
+    
+    def resume_cursor(self, phase):
+        """Cursor a truncated phase should continue after, or None"""
+        return self.phase_status.get(phase, {}).get('cursor')
+    
+    def iter_files(self, base_paths, resume=None):
+        """Yield (cursor, file path) for every file under base_paths in a stable order
+        
+        Cursors are lists of path components in which a folder's files
+        ('0' prefix) sort before its subfolders ('1' prefix), matching the
+        order of a sorted top-down walk. Folders that lie wholly before the
+        `resume` cursor are not walked again.
+        """
+        for index, base in enumerate(base_paths):
+            if not os.path.exists(base) or (resume and index < resume[0]):
+                continue
+            for root, dirs, files in os.walk(base):
+                relative = os.path.relpath(root, base)
+                prefix = [index] + ([] if relative == '.' else ['1' + part for part in relative.split(os.sep)])
+                dirs.sort()
+                if resume:
+                    dirs[:] = [d for d in dirs
+                               if prefix + ['1' + d] >= resume[:len(prefix) + 1]]
+                self.account_io(files=len(files))
+                for file in sorted(files):
+                    yield prefix + ['0' + file], os.path.join(root, file)
+    
+    def save_scan_state(self, path):
+        """Persist findings and phase cursors so a truncated scan can be resumed"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'findings': self.findings, 'phase_status': self.phase_status}, f, indent=2)
+    
+    def load_scan_state(self, path):
+        """Continue from a state written by save_scan_state, if there is one"""
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.findings = state['findings']
+        self.phase_status = state['phase_status']
+        return True
+    
+    def scan_phases(self):
+        """Ordered (name, method) list of scan phases"""
+        return [
+            ('extensions', self.scan_extensions),
+            ('databases', self.scan_databases_deep),
+            ('personal_data', self.scan_personal_data),
+            ('system_fingerprints', self.scan_system_fingerprints),
+            ('cloud_data', self.scan_cloud_data),
+            ('ai_training_data', self.scan_ai_training_data),
+            ('extension_bundles', self.scan_extension_bundles),
+            ('registry', self.scan_registry_deep),
+            ('network_traces', self.scan_network_traces)
+        ]
+    
+    def account_io(self, files=0, nbytes=0):
+        """Record I/O about to be performed, waiting on the throttle if one is set"""
+        self.io_counters['files'] += files
+        self.io_counters['bytes'] += nbytes
+        if self.io_throttle:
+            self.io_throttle.consume(files, nbytes)
+    
     def scan_extensions(self):
         """Scan for Augment extensions with version detection"""
         print("\n📦 Scanning for Augment extensions...")
         
-        vscode_paths = [
-            (os.path.expandvars(r"%APPDATA%\Code"), "VSCode"),
-            (os.path.expandvars(r"%APPDATA%\Code - Insiders"), "VSCode Insiders"),
-            (os.path.expandvars(r"%APPDATA%\Cursor"), "Cursor"),
-            (os.path.expanduser("~/.vscode"), "VSCode (User)"),
-        ]
-        
-        for base_path, ide_name in vscode_paths:
-            extensions_dir = os.path.join(base_path, "User", "extensions")
+        for _, (ide_name, extensions_dir, item) in self.budgeted_units('extensions', self.iter_extension_dirs()):
+            ext_path = os.path.join(extensions_dir, item)
+            version = self.extract_version(item)
+            
+            self.findings['extensions'].append({
+                'ide': ide_name,
+                'name': item,
+                'path': ext_path,
+                'version': version,
+                'is_newer': self.is_newer_version(version),
+                'size_mb': self.get_folder_size_mb(ext_path)
+            })
+            
+            print(f"   📦 Found: {item} (v{version}) in {ide_name}")
+            if self.is_newer_version(version):
+                print(f"       🚨 NEWER VERSION - Enhanced data collection!")
+    
+    def iter_extension_dirs(self):
+        """Yield (cursor, (ide, extensions dir, folder)) for every Augment extension folder"""
+        for index, extension_root in enumerate(self.discovery.extension_roots()):
+            extensions_dir = extension_root['path']
             if not os.path.exists(extensions_dir):
                 continue
                 
-            for item in os.listdir(extensions_dir):
+            self.account_io(files=1)
+            for item in sorted(os.listdir(extensions_dir)):
                 if any(pattern in item.lower() for pattern in ['augment', 'augmentcode']):
-                    ext_path = os.path.join(extensions_dir, item)
-                    version = self.extract_version(item)
-                    
-                    self.findings['extensions'].append({
-                        'ide': ide_name,
-                        'name': item,
-                        'path': ext_path,
-                        'version': version,
-                        'is_newer': self.is_newer_version(version),
-                        'size_mb': self.get_folder_size_mb(ext_path)
-                    })
-                    
-                    print(f"   📦 Found: {item} (v{version}) in {ide_name}")
-                    if self.is_newer_version(version):
-                        print(f"       🚨 NEWER VERSION - Enhanced data collection!")
+                    yield [index, item], (extension_root['ide'], extensions_dir, item)
     
     def scan_databases_deep(self):
         """Deep scan of VSCode databases for personal data"""
         print("\n🗄️ Deep scanning databases for personal data...")
         
-        vscode_paths = [
-            os.path.expandvars(r"%APPDATA%\Code\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Code - Insiders\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Cursor\User\globalStorage")
-        ]
-        
         personal_patterns = [
             '%username%', '%user%', '%computer%', '%machine%', '%email%',
             '%identity%', '%profile%', '%account%', '%name%', '%domain%'
         ]
         
-        for vscode_path in vscode_paths:
-            state_db = os.path.join(vscode_path, "state.vscdb")
-            if not os.path.exists(state_db):
-                continue
-                
+        state_dbs = sorted(state_db for _, state_db in self.discovery.state_databases()
+                           if os.path.exists(state_db))
+        
+        for _, state_db in self.budgeted_units('databases', ((db, db) for db in state_dbs)):
+            conn = None
             try:
-                conn = sqlite3.connect(state_db)
+                conn = self.connections.get(state_db)
                 cur = conn.cursor()
                 
+                # Let SQLite abandon a long query once the time budget is spent
+                if self.scan_budget:
+                    conn.set_progress_handler(lambda: 1 if self.budget_exhausted() else 0, 10000)
+                
+                index = self.get_item_index(state_db)
+                if not index:
+                    self.account_io(files=1, nbytes=os.path.getsize(state_db))
+                
                 # Check for personal data in database
                 personal_entries = []
                 for pattern in personal_patterns:
-                    cur.execute("SELECT key, value FROM ItemTable WHERE LOWER(key) LIKE ? OR LOWER(value) LIKE ?", 
-                              (pattern, pattern))
-                    results = cur.fetchall()
-                    personal_entries.extend(results)
+                    personal_entries.extend(self.match_item_table(cur, index, pattern))
                 
                 # Check for actual username in data
                 username = os.environ.get('USERNAME', '').lower()
                 if username:
-                    cur.execute("SELECT key, value FROM ItemTable WHERE LOWER(value) LIKE ?", 
-                              (f'%{username}%',))
-                    username_entries = cur.fetchall()
+                    username_entries = self.match_item_table(cur, index, f'%{username}%',
+                                                             columns=('value',))
                     personal_entries.extend(username_entries)
                 
                 if personal_entries:
@@ -132,38 +313,47 @@ class AugmentCleanerV2:
                     if any(username in str(entry[1]).lower() for entry in personal_entries):
                         print(f"       ⚠️ Contains your actual username: {username}")
                 
-                conn.close()
-                
+            except sqlite3.OperationalError as e:
+                if self.budget_exhausted():
+                    self.phase_status['databases']['truncated'] = True
+                    print(f"   ⏱️ Time budget reached while scanning {os.path.basename(state_db)}, databases scan is incomplete")
+                    return
+                print(f"   ❌ Error scanning {state_db}: {str(e)}")
             except Exception as e:
                 print(f"   ❌ Error scanning {state_db}: {str(e)}")
+            finally:
+                if conn and self.scan_budget:
+                    conn.set_progress_handler(None, 0)
     
     def scan_personal_data(self):
         """Scan for personal data collection"""
         print("\n👤 Scanning for personal data collection...")
         
         # Check workspace storage for personal projects
-        workspace_paths = [
-            os.path.expandvars(r"%APPDATA%\Code\User\workspaceStorage"),
-            os.path.expandvars(r"%APPDATA%\Code - Insiders\User\workspaceStorage"),
-            os.path.expandvars(r"%APPDATA%\Cursor\User\workspaceStorage")
-        ]
-        
-        for workspace_path in workspace_paths:
+        workspace_paths = [ide['workspace_storage'] for ide in self.discovery.ides()]
+        
+        workspaces = self.iter_workspace_dirs(workspace_paths)
+        for _, (workspace_path, workspace_dir) in self.budgeted_units('personal_data', workspaces):
+            workspace_full = os.path.join(workspace_path, workspace_dir)
+            if os.path.isdir(workspace_full):
+                self.account_io(files=1)
+                # Check for Augment-related files
+                for file in os.listdir(workspace_full):
+                    if 'augment' in file.lower():
+                        self.findings['personal_data'].append({
+                            'type': 'workspace_data',
+                            'path': os.path.join(workspace_full, file),
+                            'workspace': workspace_dir
+                        })
+                        print(f"   📁 Personal workspace data: {file}")
+    
+    def iter_workspace_dirs(self, workspace_paths):
+        """Yield (cursor, (workspace storage, folder)) for every workspace folder"""
+        for index, workspace_path in enumerate(workspace_paths):
             if not os.path.exists(workspace_path):
                 continue
-                
-            for workspace_dir in os.listdir(workspace_path):
-                workspace_full = os.path.join(workspace_path, workspace_dir)
-                if os.path.isdir(workspace_full):
-                    # Check for Augment-related files
-                    for file in os.listdir(workspace_full):
-                        if 'augment' in file.lower():
-                            self.findings['personal_data'].append({
-                                'type': 'workspace_data',
-                                'path': os.path.join(workspace_full, file),
-                                'workspace': workspace_dir
-                            })
-                            print(f"   📁 Personal workspace data: {file}")
+            for workspace_dir in sorted(os.listdir(workspace_path)):
+                yield [index, workspace_dir], (workspace_path, workspace_dir)
     
     def scan_system_fingerprints(self):
         """Scan for system fingerprinting data"""
@@ -176,18 +366,16 @@ class AugmentCleanerV2:
             os.path.expandvars(r"%TEMP%\Augment")
         ]
         
-        for location in fingerprint_locations:
-            if os.path.exists(location):
-                for root, dirs, files in os.walk(location):
-                    for file in files:
-                        if any(keyword in file.lower() for keyword in ['hardware', 'system', 'fingerprint', 'machine']):
-                            file_path = os.path.join(root, file)
-                            self.findings['system_fingerprints'].append({
-                                'type': 'hardware_fingerprint',
-                                'path': file_path,
-                                'size': os.path.getsize(file_path)
-                            })
-                            print(f"   🖥️ System fingerprint: {file}")
+        files = self.iter_files(fingerprint_locations, self.resume_cursor('system_fingerprints'))
+        for _, file_path in self.budgeted_units('system_fingerprints', files):
+            file = os.path.basename(file_path)
+            if any(keyword in file.lower() for keyword in ['hardware', 'system', 'fingerprint', 'machine']):
+                self.findings['system_fingerprints'].append({
+                    'type': 'hardware_fingerprint',
+                    'path': file_path,
+                    'size': os.path.getsize(file_path)
+                })
+                print(f"   🖥️ System fingerprint: {file}")
     
     def scan_cloud_data(self):
         """Scan for cloud synchronization data"""
@@ -196,30 +384,31 @@ class AugmentCleanerV2:
         cloud_patterns = ['sync', 'cloud', 'remote', 'server', 'upload', 'backup']
         
         # Check VSCode logs for cloud activity
-        log_paths = [
-            os.path.expandvars(r"%APPDATA%\Code\logs"),
-            os.path.expandvars(r"%APPDATA%\Code - Insiders\logs")
-        ]
+        log_paths = [ide['logs'] for ide in self.discovery.ides()]
         
-        for log_path in log_paths:
-            if os.path.exists(log_path):
-                for root, dirs, files in os.walk(log_path):
-                    for file in files:
-                        if file.endswith('.log'):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                    content = f.read()
-                                    if any(pattern in content.lower() for pattern in cloud_patterns):
-                                        self.findings['cloud_data'].append({
-                                            'type': 'cloud_activity_log',
-                                            'path': file_path,
-                                            'suspicious': True
-                                        })
-                                        print(f"   ☁️ Cloud activity in logs: {file}")
-                                        break
-                            except Exception:
-                                pass
+        # Only the first suspicious log in each folder is reported
+        reported_dirs = {os.path.dirname(item['path']) for item in self.findings['cloud_data']}
+        
+        files = self.iter_files(log_paths, self.resume_cursor('cloud_data'))
+        for _, file_path in self.budgeted_units('cloud_data', files):
+            file = os.path.basename(file_path)
+            if not file.endswith('.log') or os.path.dirname(file_path) in reported_dirs:
+                continue
+            try:
+                # iter_files already counted the file itself
+                self.account_io(nbytes=os.path.getsize(file_path))
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                    if any(pattern in content.lower() for pattern in cloud_patterns):
+                        self.findings['cloud_data'].append({
+                            'type': 'cloud_activity_log',
+                            'path': file_path,
+                            'suspicious': True
+                        })
+                        reported_dirs.add(os.path.dirname(file_path))
+                        print(f"   ☁️ Cloud activity in logs: {file}")
+            except Exception:
+                pass
     
     def scan_ai_training_data(self):
         """Scan for AI/ML training data collection"""
@@ -228,19 +417,42 @@ class AugmentCleanerV2:
         ai_patterns = ['training', 'model', 'ml', 'ai', 'neural', 'learning']
         
         # Check extension directories for AI data
-        for extension in self.findings['extensions']:
-            if extension['is_newer']:
-                ext_path = extension['path']
-                for root, dirs, files in os.walk(ext_path):
-                    for file in files:
-                        if any(pattern in file.lower() for pattern in ai_patterns):
-                            file_path = os.path.join(root, file)
-                            self.findings['ai_training_data'].append({
-                                'type': 'ai_training_file',
-                                'path': file_path,
-                                'extension': extension['name']
-                            })
-                            print(f"   🤖 AI training data: {file}")
+        newer_extensions = [extension for extension in self.findings['extensions'] if extension['is_newer']]
+        files = self.iter_files([extension['path'] for extension in newer_extensions],
+                                self.resume_cursor('ai_training_data'))
+        for cursor, file_path in self.budgeted_units('ai_training_data', files):
+            file = os.path.basename(file_path)
+            if any(pattern in file.lower() for pattern in ai_patterns):
+                self.findings['ai_training_data'].append({
+                    'type': 'ai_training_file',
+                    'path': file_path,
+                    'extension': newer_extensions[cursor[0]]['name']
+                })
+                print(f"   🤖 AI training data: {file}")
+    
+    def scan_extension_bundles(self):
+        """Scan extension JS bundles for endpoints and telemetry fields"""
+        print("\n🔎 Scanning extension bundles for endpoints and telemetry...")
+        
+        extensions = ((extension['path'], extension) for extension in sorted(self.findings['extensions'], key=lambda ext: ext['path']))
+        for _, extension in self.budgeted_units('extension_bundles', extensions):
+            try:
+                analysis = self.bundle_scanner.analyse_extension(extension['path'], extension['name'])
+            except Exception as e:
+                print(f"   ❌ Error scanning bundles of {extension['name']}: {str(e)}")
+                continue
+            
+            extension['bundle_analysis'] = analysis
+            # The extension itself was recorded before its analysis existed
+            if self.results:
+                self.results.add_finding('extension_bundles', {
+                    'path': extension['path'],
+                    'name': extension['name'],
+                    'endpoints': endpoint_hostnames(analysis),
+                    'bundle_analysis': analysis
+                }, extension['version'])
+            print(f"   🔎 {extension['name']}: {len(endpoint_hostnames(analysis))} endpoint host(s), "
+                  f"{len(analysis['telemetry_keys'])} telemetry field(s)")
     
     def scan_registry_deep(self):
         """Deep scan of Windows Registry for Augment data"""
@@ -253,7 +465,7 @@ class AugmentCleanerV2:
                 (winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Uninstall")
             ]
             
-            for hkey, path in registry_paths:
+            for _, (hkey, path) in self.budgeted_units('registry', enumerate(registry_paths)):
                 try:
                     with winreg.OpenKey(hkey, path) as key:
                         i = 0
@@ -279,20 +491,70 @@ class AugmentCleanerV2:
         """Scan for network activity traces"""
         print("\n🌐 Scanning for network traces...")
         
+        # Endpoints actually shipped in the installed extension bundles
+        hostnames = sorted({host for extension in self.findings['extensions']
+                            for host in endpoint_hostnames(extension.get('bundle_analysis', {'hostnames': []}))})
+        
         # Check hosts file
         hosts_file = r"C:\Windows\System32\drivers\etc\hosts"
         try:
             if os.path.exists(hosts_file):
+                self.account_io(files=1, nbytes=os.path.getsize(hosts_file))
                 with open(hosts_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if 'augment' in content.lower():
+                    content = f.read().lower()
+                    matched_hosts = [host for host in hostnames if host in content]
+                    if 'augment' in content or matched_hosts:
                         self.findings['network_traces'].append({
                             'type': 'hosts_file_entry',
-                            'path': hosts_file
+                            'path': hosts_file,
+                            'hostnames': matched_hosts
                         })
                         print("   🌐 Found Augment entries in hosts file")
         except Exception:
             pass
+        
+        # Check the DNS client cache for recently resolved bundle endpoints
+        if hostnames and os.name == 'nt':
+            try:
+                result = subprocess.run(['ipconfig', '/displaydns'], capture_output=True,
+                                        text=True, errors='ignore', timeout=30)
+                dns_cache = result.stdout.lower()
+                resolved = [host for host in hostnames if host in dns_cache]
+                if resolved:
+                    self.findings['network_traces'].append({
+                        'type': 'dns_cache_entry',
+                        'hostnames': resolved
+                    })
+                    print(f"   🌐 Recently resolved Augment endpoints: {', '.join(resolved)}")
+            except Exception:
+                pass
+    
+    def get_item_index(self, state_db):
+        """Return the refreshed sidecar index for a database, if indexing is enabled"""
+        if not self.use_index:
+            return None
+        
+        try:
+            index = self.item_indexes.get(state_db)
+            if index is None:
+                index = ItemTableIndex(state_db, self.index_dir)
+                self.item_indexes[state_db] = index
+            index.refresh(self.connections.get(state_db))
+            return index
+        except Exception as e:
+            if self.budget_exhausted():
+                raise
+            print(f"   ⚠️ Index unavailable for {os.path.basename(state_db)}, scanning directly: {str(e)}")
+            return None
+    
+    def match_item_table(self, cur, index, pattern, columns=('key', 'value')):
+        """Return ItemTable (key, value) rows where any column matches a LIKE pattern"""
+        if index:
+            return index.match(pattern, columns)
+        
+        conditions = ' OR '.join(f"LOWER({column}) LIKE ?" for column in columns)
+        cur.execute(f"SELECT key, value FROM ItemTable WHERE {conditions}", (pattern,) * len(columns))
+        return cur.fetchall()
     
     def extract_version(self, extension_name):
         """Extract version from extension name"""
@@ -314,6 +576,7 @@ class AugmentCleanerV2:
         try:
             total_size = 0
             for dirpath, dirnames, filenames in os.walk(folder_path):
+                self.account_io(files=len(filenames))
                 for filename in filenames:
                     filepath = os.path.join(dirpath, filename)
                     if os.path.exists(filepath):
@@ -347,6 +610,12 @@ class AugmentCleanerV2:
         if fingerprint_items > 0:
             print(f"\n🖥️ SYSTEM FINGERPRINTING: {fingerprint_items} hardware fingerprint files found")
         
+        # Show phases cut short by the time budget
+        incomplete = [name for name, _ in self.scan_phases()
+                      if not self.phase_status.get(name, {}).get('complete')]
+        if incomplete:
+            print(f"\n⏱️ PARTIAL RESULTS: time budget reached before finishing: {', '.join(incomplete)}")
+        
         return total_items > 0
     
     def clean_all_findings(self):
@@ -356,6 +625,7 @@ class AugmentCleanerV2:
             return 0
         
         print("\n🧹 Starting enhanced Augment removal...")
+        started = time.perf_counter()
         
         # Clean extensions
         for ext in self.findings['extensions']:
@@ -381,6 +651,12 @@ class AugmentCleanerV2:
         # Clean registry entries
         for reg_entry in self.findings['registry_entries']:
             self.clean_registry_entry(reg_entry)
+        self.connections.close_all()
+        
+        if self.results:
+            self.results.add_timing('clean', time.perf_counter() - started)
+            self.results.add_counter('cleaned_items', self.cleaned_items)
+            self.results.flush()
         
         print(f"\n✅ Enhanced cleaning completed! Removed {self.cleaned_items} items.")
         print(f"💾 Backups saved to: {self.backup_dir}")
@@ -399,6 +675,7 @@ class AugmentCleanerV2:
                 # Remove extension
                 shutil.rmtree(ext_path)
                 self.cleaned_items += 1
+                self.record_cleaned('extensions', ext_path, int(ext_info.get('size_mb', 0) * 1024 * 1024))
                 print(f"   ✅ Removed extension: {ext_info['name']}")
         except Exception as e:
             print(f"   ❌ Failed to remove extension: {str(e)}")
@@ -412,19 +689,16 @@ class AugmentCleanerV2:
                 backup_path = os.path.join(self.backup_dir, f"database_{os.path.basename(db_path)}")
                 shutil.copy2(db_path, backup_path)
                 
-                # Remove personal data entries
-                conn = sqlite3.connect(db_path)
-                cur = conn.cursor()
-                
                 # Remove entries containing personal data
+                # Matched against the live table, never the sidecar index,
+                # which can lag behind in-place updates
                 personal_patterns = ['%augment%', '%username%', '%user%', '%computer%']
-                for pattern in personal_patterns:
-                    cur.execute("DELETE FROM ItemTable WHERE LOWER(key) LIKE ? OR LOWER(value) LIKE ?", 
-                              (pattern, pattern))
-                
-                conn.commit()
-                conn.close()
+                with write_transaction(db_path, self.busy_timeout_ms) as conn:
+                    for pattern in personal_patterns:
+                        conn.execute("DELETE FROM ItemTable WHERE LOWER(key) LIKE ? OR LOWER(value) LIKE ?", 
+                                   (pattern, pattern))
                 self.cleaned_items += 1
+                self.record_cleaned('personal_data', db_path)
                 print(f"   ✅ Cleaned personal data from: {os.path.basename(db_path)}")
         except Exception as e:
             print(f"   ❌ Failed to clean database: {str(e)}")
@@ -439,8 +713,10 @@ class AugmentCleanerV2:
                 shutil.copy2(file_path, backup_path)
                 
                 # Remove file
+                nbytes = os.path.getsize(file_path)
                 os.remove(file_path)
                 self.cleaned_items += 1
+                self.record_cleaned('system_fingerprints', file_path, nbytes)
                 print(f"   ✅ Removed fingerprint file: {os.path.basename(file_path)}")
         except Exception as e:
             print(f"   ❌ Failed to remove fingerprint: {str(e)}")
@@ -455,6 +731,7 @@ class AugmentCleanerV2:
                 shutil.copy2(file_path, backup_path)
                 
                 # Remove or clean file
+                nbytes = os.path.getsize(file_path)
                 if cloud_info['type'] == 'cloud_activity_log':
                     # Clear log content instead of deleting
                     with open(file_path, 'w') as f:
@@ -463,6 +740,7 @@ class AugmentCleanerV2:
                     os.remove(file_path)
                 
                 self.cleaned_items += 1
+                self.record_cleaned('cloud_data', file_path, nbytes)
                 print(f"   ✅ Cleaned cloud data: {os.path.basename(file_path)}")
         except Exception as e:
             print(f"   ❌ Failed to clean cloud data: {str(e)}")
@@ -477,8 +755,10 @@ class AugmentCleanerV2:
                 shutil.copy2(file_path, backup_path)
                 
                 # Remove AI training file
+                nbytes = os.path.getsize(file_path)
                 os.remove(file_path)
                 self.cleaned_items += 1
+                self.record_cleaned('ai_training_data', file_path, nbytes)
                 print(f"   ✅ Removed AI training data: {os.path.basename(file_path)}")
         except Exception as e:
             print(f"   ❌ Failed to remove AI data: {str(e)}")
@@ -491,18 +771,70 @@ class AugmentCleanerV2:
         except Exception as e:
             print(f"   ❌ Registry cleaning error: {str(e)}")
 
+def default_resume_path():
+    """Where a scan cut short by its time budget saves its progress"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'scan_resume.json')
+
+def get_option(name):
+    """Value following a command line option, or None"""
+    if name in sys.argv and sys.argv.index(name) + 1 < len(sys.argv):
+        return sys.argv[sys.argv.index(name) + 1]
+    return None
+
+def get_seconds_option(name):
+    """Non-negative number of seconds given for an option, or None if absent
+    
+    Raises ValueError when the option is present without a valid number.
+    """
+    if name not in sys.argv:
+        return None
+    value = get_option(name)
+    if value is None:
+        raise ValueError(f"{name} needs a number of seconds")
+    seconds = float(value)
+    if seconds < 0:
+        raise ValueError(f"{name} cannot be negative")
+    return seconds
+
 def main():
     """Main function for enhanced Augment cleaner"""
     print("🧹 Augment Cleaner v2.0 - Enhanced Privacy Protection")
     print("Specifically designed for newer Augment versions (0.492.2+)")
     print("=" * 60)
     
-    cleaner = AugmentCleanerV2()
+    try:
+        total_budget = get_seconds_option('--budget')
+        phase_budget = get_seconds_option('--phase-budget')
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        print("Usage: AugmentCleaner.exe [--index] [--budget <seconds>] [--phase-budget <seconds>] "
+              "[--resume] [--no-history]")
+        print("\nPress Enter to exit...")
+        input()
+        return
+    
+    results = None if '--no-history' in sys.argv else ResultsStore()
+    cleaner = AugmentCleanerV2(use_index='--index' in sys.argv, results=results)
+    
+    if total_budget is not None or phase_budget is not None:
+        cleaner.scan_budget = ScanBudget(total_budget, phase_budget)
+    
+    resume_path = default_resume_path()
+    if '--resume' in sys.argv and cleaner.load_scan_state(resume_path):
+        print("⏩ Resuming the previous scan where it stopped")
     
     try:
         # Scan for Augment data
         found_items = cleaner.scan_for_newer_augment()
         
+        if cleaner.scan_complete():
+            if os.path.exists(resume_path):
+                os.remove(resume_path)
+        else:
+            cleaner.save_scan_state(resume_path)
+            print("⏱️ Scan stopped at its time budget. Run again with --resume to continue.")
+        
         if not found_items:
             print("\n✅ No Augment installations found. Your system appears clean!")
             return
@@ -528,6 +860,8 @@ def main():
         print(f"\n❌ Error: {str(e)}")
     
     finally:
+        if results:
+            results.close()
         print("\nPress Enter to exit...")
         input()
 
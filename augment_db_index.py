@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import hashlib
+
+from augment_sqlite import connect_readonly
+
+
+def default_index_dir():
+    """Directory holding sidecar indexes, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'index')
+
+
+class ItemTableIndex:
+    """Persistent sidecar search index for the ItemTable of a state.vscdb
+
+    The index lives in its own SQLite file and is never written into the
+    IDE database. It uses an FTS5 trigram table when SQLite supports it, so
+    '%text%' LIKE patterns are answered from the index instead of a full
+    scan that lowercases every row. Older SQLite builds fall back to a plain
+    lowercased copy of the table.
+
+    Refreshes are incremental. VSCode writes ItemTable rows with INSERT and
+    a REPLACE conflict clause, so every new or changed row gets a new rowid.
+    Comparing (rowid, key, length(value)) finds the changed rows, and only
+    those values are copied. New rows always take rowids above the ones
+    that survived, so a deleted and re-inserted top row can reuse its
+    rowid and key; rowids from the previous maximum up are therefore
+    always re-indexed. An in-place UPDATE to a value of the same length is
+    still missed, so the index is only used to report matches; cleaning
+    always queries the live table.
+    """
+
+    REFRESH_CHUNK = 500
+
+    def __init__(self, db_path, index_dir=None):
+        self.db_path = os.path.abspath(db_path)
+        index_dir = index_dir or default_index_dir()
+        os.makedirs(index_dir, exist_ok=True)
+
+        name = hashlib.sha1(self.db_path.lower().encode('utf-8')).hexdigest()[:16]
+        self.index_path = os.path.join(index_dir, f"{name}.index.db")
+        self.conn = sqlite3.connect(self.index_path)
+        self.uses_fts = self.create_schema()
+
+    def create_schema(self):
+        """Create the index tables, returning True when FTS5 is in use"""
+        cur = self.conn.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        cur.execute("CREATE TABLE IF NOT EXISTS rows (rowid INTEGER PRIMARY KEY, key TEXT, size INTEGER)")
+        if 'size' not in [column[1] for column in cur.execute("PRAGMA table_info(rows)")]:
+            # Indexes from before the size marker re-index every row once
+            cur.execute("ALTER TABLE rows ADD COLUMN size INTEGER")
+
+        kind = self.get_meta('kind')
+        if kind is None:
+            try:
+                cur.execute("CREATE VIRTUAL TABLE items USING fts5(key, value, tokenize='trigram')")
+                kind = 'fts5'
+            except sqlite3.OperationalError:
+                cur.execute("CREATE TABLE items (rowid INTEGER PRIMARY KEY, key TEXT, value TEXT)")
+                kind = 'plain'
+            self.set_meta('kind', kind)
+            self.set_meta('database', self.db_path)
+            self.conn.commit()
+
+        return kind == 'fts5'
+
+    def get_meta(self, name):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def source_signature(self):
+        """Cheap change marker for the IDE database and its WAL file"""
+        parts = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return '|'.join(parts)
+
+    def refresh(self, source=None):
+        """Bring the index up to date, returning the number of rows touched
+
+        `source` is an open read-only connection to the IDE database; one
+        is opened (and closed again) when it is not supplied.
+        """
+        signature = self.source_signature()
+        if signature == self.get_meta('signature'):
+            return 0
+
+        owns_source = source is None
+        if owns_source:
+            source = connect_readonly(self.db_path)
+        try:
+            current = {rowid: (key, size) for rowid, key, size
+                       in source.execute("SELECT rowid, key, length(value) FROM ItemTable")}
+            indexed = {rowid: (key, size) for rowid, key, size
+                       in self.conn.execute("SELECT rowid, key, size FROM rows")}
+            top = max(indexed, default=0)
+
+            stale = {rowid for rowid, row in indexed.items() if rowid >= top or current.get(rowid) != row}
+            removed = [(rowid,) for rowid in stale]
+            added = sorted(rowid for rowid, row in current.items() if rowid in stale or rowid not in indexed)
+
+            cur = self.conn.cursor()
+            cur.executemany("DELETE FROM rows WHERE rowid = ?", removed)
+            cur.executemany("DELETE FROM items WHERE rowid = ?", removed)
+
+            for start in range(0, len(added), self.REFRESH_CHUNK):
+                chunk = added[start:start + self.REFRESH_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = source.execute(
+                    f"SELECT rowid, key, value FROM ItemTable WHERE rowid IN ({placeholders})",
+                    chunk).fetchall()
+                cur.executemany("INSERT INTO rows (rowid, key, size) VALUES (?, ?, ?)",
+                                [(rowid, key, current[rowid][1]) for rowid, key, _ in rows])
+                cur.executemany("INSERT INTO items (rowid, key, value) VALUES (?, ?, ?)",
+                                [self.index_row(*row) for row in rows])
+
+            self.set_meta('signature', signature)
+            self.conn.commit()
+            return len(removed) + len(added)
+        finally:
+            if owns_source:
+                source.close()
+
+    def index_row(self, rowid, key, value):
+        """Convert an ItemTable row into the text stored in the index"""
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', errors='replace')
+        elif value is not None:
+            value = str(value)
+
+        if not self.uses_fts:
+            return rowid, (key or '').lower(), (value or '').lower()
+        return rowid, key, value
+
+    def match(self, pattern, columns=('key', 'value')):
+        """Return (key, value) rows where any column is LIKE the pattern
+
+        Matching is case-insensitive, like LOWER(column) LIKE pattern on
+        the IDE database. The values returned are the indexed text.
+        """
+        pattern = pattern.lower()
+        subqueries = ' UNION '.join(f"SELECT rowid FROM items WHERE {column} LIKE ?"
+                                    for column in columns)
+        query = (f"SELECT rows.key, items.value FROM items JOIN rows ON rows.rowid = items.rowid "
+                 f"WHERE items.rowid IN ({subqueries})")
+        return self.conn.execute(query, (pattern,) * len(columns)).fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,189 @@
+import os
+import json
+
+
+# Friendly names for well-known VSCode-family user data folders
+IDE_NAMES = {
+    'Code': 'VSCode',
+    'Code - Insiders': 'VSCode Insiders',
+    'Code - OSS': 'Code - OSS',
+    'Cursor': 'Cursor',
+    'VSCodium': 'VSCodium',
+    'Windsurf': 'Windsurf',
+}
+
+# Home folders that hold an `extensions` directory for a VSCode-family IDE
+EXTENSION_HOME_DIRS = {
+    '.vscode': 'VSCode (User)',
+    '.vscode-insiders': 'VSCode Insiders (User)',
+    '.vscode-oss': 'VSCodium (User)',
+    '.cursor': 'Cursor (User)',
+    '.windsurf': 'Windsurf (User)',
+}
+
+
+def default_cache_path():
+    """Discovery cache file, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'ide_roots.json')
+
+
+def profile_dirs():
+    """Directories that contain per-IDE user data folders"""
+    candidates = [
+        os.environ.get('APPDATA'),
+        os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'),
+        os.path.expanduser('~/Library/Application Support'),
+    ]
+    return [path for path in dict.fromkeys(candidates) if path and os.path.isdir(path)]
+
+
+def get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class IDEDiscovery:
+    """Finds every VSCode-family IDE root and extension directory
+
+    One bounded-depth pass looks for <profile>/<IDE>/User/globalStorage/
+    state.vscdb under each profile directory, plus ~/.<ide>/extensions.
+    Results are cached in memory and on disk together with the mtimes of
+    the directories they were derived from; the cache is reused for as long
+    as none of those mtimes change. The home directory itself is not
+    watched, since every dotfile write would change its mtime; only the
+    known ~/.<ide> folders (present or not) and any other extension homes
+    found are.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or default_cache_path()
+        self.cache = None
+
+    def get_roots(self):
+        """Return {'ides': [...], 'extension_roots': [...]}, rediscovering if stale"""
+        if self.cache is None:
+            self.cache = self.load_cache()
+
+        if self.cache is None or not self.is_valid(self.cache):
+            self.cache = self.discover()
+            self.save_cache(self.cache)
+
+        return self.cache
+
+    def ides(self):
+        """IDE records, one per VSCode-family user data folder"""
+        return self.get_roots()['ides']
+
+    def state_databases(self):
+        """(ide name, state.vscdb path) for every IDE that has one"""
+        return [(ide['name'], ide['state_db']) for ide in self.ides() if ide['state_db']]
+
+    def extension_roots(self):
+        """{'ide', 'path'} records for every extensions directory"""
+        return self.get_roots()['extension_roots']
+
+    def invalidate(self):
+        self.cache = None
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def is_valid(self, cache):
+        watched = cache.get('watched')
+        if not isinstance(watched, dict):
+            return False
+        return all(get_mtime(path) == mtime for path, mtime in watched.items())
+
+    def discover(self):
+        """Walk the profile directories once and build a fresh cache"""
+        ides = []
+        extension_roots = []
+        watched = {}
+
+        for profile in profile_dirs():
+            watched[profile] = get_mtime(profile)
+            try:
+                entries = sorted(os.scandir(profile), key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            for entry in entries:
+                user_dir = os.path.join(entry.path, 'User')
+                if not entry.is_dir() or not os.path.isdir(user_dir):
+                    continue
+
+                # Watch User/ and globalStorage/ so a database created later is noticed
+                global_storage = os.path.join(user_dir, 'globalStorage')
+                watched[user_dir] = get_mtime(user_dir)
+                if os.path.isdir(global_storage):
+                    watched[global_storage] = get_mtime(global_storage)
+
+                state_db = os.path.join(global_storage, 'state.vscdb')
+                extensions_dir = os.path.join(user_dir, 'extensions')
+                if not os.path.isfile(state_db) and not os.path.isdir(extensions_dir):
+                    continue
+
+                name = IDE_NAMES.get(entry.name, entry.name)
+                ides.append({
+                    'name': name,
+                    'root': entry.path,
+                    'user_dir': user_dir,
+                    'global_storage': global_storage,
+                    'state_db': state_db if os.path.isfile(state_db) else None,
+                    'workspace_storage': os.path.join(user_dir, 'workspaceStorage'),
+                    'logs': os.path.join(entry.path, 'logs'),
+                })
+                if os.path.isdir(extensions_dir):
+                    extension_roots.append({'ide': name, 'path': extensions_dir})
+
+        home = os.path.expanduser('~')
+        # A missing folder is recorded as None, so creating it later is noticed
+        for name in EXTENSION_HOME_DIRS:
+            path = os.path.join(home, name)
+            watched[path] = get_mtime(path)
+        try:
+            home_entries = sorted(os.scandir(home), key=lambda entry: entry.name)
+        except OSError:
+            home_entries = []
+
+        for entry in home_entries:
+            if not entry.name.startswith('.') or not entry.is_dir():
+                continue
+            extensions_dir = os.path.join(entry.path, 'extensions')
+            if entry.name in EXTENSION_HOME_DIRS or os.path.isfile(os.path.join(extensions_dir, 'extensions.json')):
+                watched[entry.path] = get_mtime(entry.path)
+                if os.path.isdir(extensions_dir):
+                    extension_roots.append({
+                        'ide': EXTENSION_HOME_DIRS.get(entry.name, f"{entry.name[1:]} (User)"),
+                        'path': extensions_dir
+                    })
+
+        return {'ides': ides, 'extension_roots': extension_roots, 'watched': watched}
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_cache(self, cache):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass
+
+
+_shared_discovery = None
+
+
+def shared_discovery():
+    """Process-wide IDEDiscovery instance used by the scanners and the shield"""
+    global _shared_discovery
+    if _shared_discovery is None:
+        _shared_discovery = IDEDiscovery()
+    return _shared_discovery
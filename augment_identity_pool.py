@@ -0,0 +1,160 @@
+import os
+import json
+import random
+
+FAKE_NAMES = ["DevUser", "CodeMaster", "TechGuru", "BuildBot", "TestUser"]
+FAKE_COMPUTERS = ["DEV-MACHINE", "BUILD-SERVER", "TEST-PC", "CODE-STATION"]
+FAKE_DOMAINS = ["WORKGROUP", "DEV-DOMAIN", "TEST-LAB"]
+
+# (brand, model, cores) so a fake CPU never pairs an Intel brand with a Ryzen model
+FAKE_CPUS = [
+    ("Intel", "Core i5-10400", 6), ("Intel", "Core i7-11700", 8),
+    ("AMD", "Ryzen 5 5600X", 6), ("AMD", "Ryzen 7 5800X", 8),
+    ("Intel", "Core i9-12900K", 16)
+]
+
+FAKE_GPUS = [
+    "NVIDIA GeForce GTX 1660", "NVIDIA RTX 3060",
+    "AMD Radeon RX 6600", "Intel UHD Graphics 630"
+]
+
+FAKE_SOFTWARE = [
+    "Visual Studio Code", "Git", "Node.js", "Python 3.9",
+    "Google Chrome", "Firefox", "7-Zip", "Notepad++",
+    "Docker Desktop", "Postman", "FileZilla", "VLC Media Player"
+]
+
+GB = 1024 * 1024 * 1024
+
+
+def default_pool_path():
+    """Identity pool file, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'identity_pool.json')
+
+
+def generate_identity(rng):
+    """Build one internally consistent fake identity from `rng`"""
+    username = rng.choice(FAKE_NAMES)
+    return {
+        'username': username,
+        'computername': rng.choice(FAKE_COMPUTERS),
+        'userdomain': rng.choice(FAKE_DOMAINS),
+        'userprofile': f"C:\\Users\\{username}",
+        'processor': generate_cpu(rng),
+        'memory': generate_memory(rng),
+        'gpu': generate_gpu(rng),
+        'network': generate_network(rng),
+        'software': list(FAKE_SOFTWARE)
+    }
+
+
+def generate_cpu(rng):
+    brand, model, cores = rng.choice(FAKE_CPUS)
+    return {
+        'brand': brand,
+        'model': model,
+        'cores': cores,
+        'speed': f"{rng.uniform(2.5, 4.5):.1f} GHz"
+    }
+
+
+def generate_memory(rng):
+    total_gb = rng.choice([8, 16, 32])
+    return {
+        'total': total_gb * GB,
+        'available': rng.randint(total_gb // 4, total_gb * 3 // 4) * GB,
+        'type': rng.choice(["DDR4", "DDR5"])
+    }
+
+
+def generate_gpu(rng):
+    return {
+        'model': rng.choice(FAKE_GPUS),
+        'memory': rng.choice([4, 6, 8, 12]) * GB
+    }
+
+
+def generate_network(rng):
+    subnet = rng.randint(1, 254)
+    # Locally administered unicast MAC, like a virtual adapter's
+    mac = [rng.randint(0, 255) for _ in range(6)]
+    mac[0] = (mac[0] & 0xFC) | 0x02
+    return {
+        'ip': f"192.168.{subnet}.{rng.randint(2, 254)}",
+        'mac': ':'.join(f"{octet:02x}" for octet in mac),
+        'dns': ["8.8.8.8", "1.1.1.1"],
+        'gateway': f"192.168.{subnet}.1"
+    }
+
+
+class FakeIdentityPool:
+    """Seeded, precomputed pool of fake identities for the privacy shield
+
+    Every identity is generated up front from random.Random(seed), so the
+    same seed always yields the same pool and rotation is only a list
+    lookup. Identities are kept distinct by (username, computername) while
+    the name lists allow it, so a rotation always changes what Augment sees.
+    """
+
+    def __init__(self, seed=None, size=16, path=None):
+        self.seed = random.SystemRandom().randrange(2 ** 32) if seed is None else seed
+        self.size = size
+        self.path = path
+        self.index = 0
+        self.identities = self.generate()
+
+    def generate(self):
+        rng = random.Random(self.seed)
+        max_distinct = len(FAKE_NAMES) * len(FAKE_COMPUTERS)
+        identities, seen = [], set()
+        while len(identities) < self.size:
+            identity = generate_identity(rng)
+            name = (identity['username'], identity['computername'])
+            if name in seen and len(seen) < max_distinct:
+                continue
+            seen.add(name)
+            identities.append(identity)
+        return identities
+
+    def current(self):
+        return self.identities[self.index]
+
+    def rotate(self):
+        """Advance to the next identity and return it"""
+        self.index = (self.index + 1) % len(self.identities)
+        return self.current()
+
+    @classmethod
+    def load(cls, path=None, seed=None, size=16):
+        """Load the saved pool, or create one when missing or seeded differently"""
+        path = path or default_pool_path()
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+            if seed is None or state['seed'] == seed:
+                pool = cls.__new__(cls)
+                pool.seed = state['seed']
+                pool.size = len(state['identities'])
+                pool.path = path
+                pool.index = state['index'] % pool.size
+                pool.identities = state['identities']
+                return pool
+        except (OSError, ValueError, KeyError, ZeroDivisionError):
+            pass
+
+        pool = cls(seed, size, path)
+        pool.save()
+        return pool
+
+    def save(self):
+        path = self.path or default_pool_path()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            temp_path = path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump({'seed': self.seed, 'index': self.index,
+                           'identities': self.identities}, f, indent=2)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
@@ -1,93 +1,60 @@
 import os
 import sys
 import json
-import random
+import time
+import base64
 import string
 import winreg
 import subprocess
 from datetime import datetime
-import sqlite3
 import shutil
 
+from augment_ide_discovery import shared_discovery
+from augment_identity_pool import FakeIdentityPool
+from augment_results_store import ResultsStore
+from augment_sqlite import connect_readonly, write_transaction, DEFAULT_BUSY_TIMEOUT_MS
+
 class AugmentPrivacyShield:
     """Privacy protection layer that feeds fake data to Augment Code"""
     
-    def __init__(self):
+    def __init__(self, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS, results=None, identity_pool=None):
+        self.identity_pool = identity_pool or FakeIdentityPool.load()
         self.fake_data = self.generate_fake_system_data()
         self.original_env = {}
         self.protection_active = False
+        self.busy_timeout_ms = busy_timeout_ms
+        self.results = results
         
     def generate_fake_system_data(self):
-        """Generate convincing fake system information"""
-        fake_names = ["DevUser", "CodeMaster", "TechGuru", "BuildBot", "TestUser"]
-        fake_computers = ["DEV-MACHINE", "BUILD-SERVER", "TEST-PC", "CODE-STATION"]
-        fake_domains = ["WORKGROUP", "DEV-DOMAIN", "TEST-LAB"]
-        
-        return {
-            'username': random.choice(fake_names),
-            'computername': random.choice(fake_computers),
-            'userdomain': random.choice(fake_domains),
-            'userprofile': f"C:\\Users\\{random.choice(fake_names)}",
-            'processor': self.generate_fake_cpu(),
-            'memory': self.generate_fake_memory(),
-            'gpu': self.generate_fake_gpu(),
-            'network': self.generate_fake_network(),
-            'software': self.generate_fake_software_list()
-        }
-    
-    def generate_fake_cpu(self):
-        """Generate fake CPU information"""
-        cpu_brands = ["Intel", "AMD"]
-        cpu_models = [
-            "Core i5-10400", "Core i7-11700", "Ryzen 5 5600X", 
-            "Ryzen 7 5800X", "Core i9-12900K"
-        ]
-        return {
-            'brand': random.choice(cpu_brands),
-            'model': random.choice(cpu_models),
-            'cores': random.choice([4, 6, 8, 12]),
-            'speed': f"{random.uniform(2.5, 4.5):.1f} GHz"
-        }
-    
-    def generate_fake_memory(self):
-        """Generate fake memory information"""
-        return {
-            'total': random.choice([8, 16, 32]) * 1024 * 1024 * 1024,  # GB in bytes
-            'available': random.randint(4, 16) * 1024 * 1024 * 1024,
-            'type': random.choice(["DDR4", "DDR5"])
-        }
-    
-    def generate_fake_gpu(self):
-        """Generate fake GPU information"""
-        gpu_models = [
-            "NVIDIA GeForce GTX 1660", "NVIDIA RTX 3060", 
-            "AMD Radeon RX 6600", "Intel UHD Graphics 630"
-        ]
-        return {
-            'model': random.choice(gpu_models),
-            'memory': random.choice([4, 6, 8, 12]) * 1024 * 1024 * 1024
-        }
+        """Current identity from the seeded fake identity pool"""
+        return self.identity_pool.current()
     
-    def generate_fake_network(self):
-        """Generate fake network configuration"""
-        return {
-            'ip': f"192.168.{random.randint(1, 254)}.{random.randint(1, 254)}",
-            'mac': ':'.join([f"{random.randint(0, 255):02x}" for _ in range(6)]),
-            'dns': ["8.8.8.8", "1.1.1.1"],
-            'gateway': f"192.168.{random.randint(1, 254)}.1"
-        }
-    
-    def generate_fake_software_list(self):
-        """Generate fake installed software list"""
-        return [
-            "Visual Studio Code", "Git", "Node.js", "Python 3.9",
-            "Google Chrome", "Firefox", "7-Zip", "Notepad++",
-            "Docker Desktop", "Postman", "FileZilla", "VLC Media Player"
-        ]
+    def rotate_identity(self):
+        """Swap every fake data source over to the pool's next identity
+        
+        The environment, registry stand-in, AugmentShield temp files and
+        each IDE database (one transaction apiece) are rewritten together.
+        Database snapshots taken at activation are left alone, so
+        deactivating still restores the real values.
+        """
+        started = time.perf_counter()
+        self.fake_data = self.identity_pool.rotate()
+        self.identity_pool.save()
+        print(f"🔁 Rotating to identity {self.identity_pool.index + 1}/{len(self.identity_pool.identities)}...")
+        
+        if self.protection_active:
+            self.set_fake_environment()
+            self.create_fake_registry_entries()
+            self.setup_filesystem_interception()
+            self.monitor_vscode_databases()
+        
+        self.record_timing('rotate', time.perf_counter() - started)
+        print(f"✅ Identity rotated in {(time.perf_counter() - started) * 1000:.0f} ms")
     
     def activate_protection(self):
         """Activate privacy protection by modifying environment and system calls"""
         print("🛡️ Activating Augment Privacy Shield...")
+        started = time.perf_counter()
         
         # Backup original environment variables
         self.backup_environment()
@@ -102,6 +69,7 @@ class AugmentPrivacyShield:
         self.setup_data_interception()
         
         self.protection_active = True
+        self.record_timing('activate', time.perf_counter() - started)
         print("✅ Privacy Shield activated! Fake data will be provided to Augment.")
     
     def backup_environment(self):
@@ -190,54 +158,76 @@ class AugmentPrivacyShield:
     
     def monitor_vscode_databases(self):
         """Monitor and modify VSCode databases to inject fake data"""
-        vscode_paths = [
-            os.path.expandvars(r"%APPDATA%\Code\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Code - Insiders\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Cursor\User\globalStorage")
-        ]
-        
-        for vscode_path in vscode_paths:
-            state_db = os.path.join(vscode_path, "state.vscdb")
+        for _, state_db in shared_discovery().state_databases():
             if os.path.exists(state_db):
                 self.inject_fake_data_to_database(state_db)
     
+    def build_fake_entries(self):
+        """Build the ItemTable rows the shield writes into each database"""
+        return [
+            ('augment.system.username', self.fake_data['username']),
+            ('augment.system.computername', self.fake_data['computername']),
+            ('augment.system.processor', json.dumps(self.fake_data['processor'])),
+            ('augment.system.memory', json.dumps(self.fake_data['memory'])),
+            ('augment.system.network', json.dumps(self.fake_data['network'])),
+            ('augment.telemetry.hardware', json.dumps({
+                'cpu': self.fake_data['processor'],
+                'memory': self.fake_data['memory'],
+                'gpu': self.fake_data['gpu']
+            }))
+        ]
+    
+    def snapshot_path(self, db_path):
+        """Path of the key-level snapshot kept next to a database"""
+        return db_path + ".shield_snapshot"
+    
     def inject_fake_data_to_database(self, db_path):
         """Inject fake data into VSCode state database"""
         try:
-            # Backup original database
-            backup_path = db_path + ".shield_backup"
-            shutil.copy2(db_path, backup_path)
+            fake_entries = self.build_fake_entries()
+            snapshot_path = self.snapshot_path(db_path)
             
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
+            # Record the prior value (or absence) of every key we overwrite.
+            # An existing snapshot already holds the real values from an
+            # earlier activation, so it must not be replaced by fake ones.
+            # This happens before the write transaction, so the IDE is not
+            # locked out while the snapshot file is written.
+            if not os.path.exists(snapshot_path):
+                snapshot = {}
+                conn = connect_readonly(db_path, self.busy_timeout_ms)
+                try:
+                    for key, _ in fake_entries:
+                        row = conn.execute("SELECT value FROM ItemTable WHERE key = ?", (key,)).fetchone()
+                        snapshot[key] = self.encode_snapshot_value(row[0]) if row else None
+                finally:
+                    conn.close()
+                
+                with open(snapshot_path, 'w') as f:
+                    json.dump({'database': db_path, 'keys': snapshot}, f, indent=2)
             
-            # Inject fake system information
-            fake_entries = [
-                ('augment.system.username', self.fake_data['username']),
-                ('augment.system.computername', self.fake_data['computername']),
-                ('augment.system.processor', json.dumps(self.fake_data['processor'])),
-                ('augment.system.memory', json.dumps(self.fake_data['memory'])),
-                ('augment.system.network', json.dumps(self.fake_data['network'])),
-                ('augment.telemetry.hardware', json.dumps({
-                    'cpu': self.fake_data['processor'],
-                    'memory': self.fake_data['memory'],
-                    'gpu': self.fake_data['gpu']
-                }))
-            ]
-            
-            for key, value in fake_entries:
-                # Insert or update fake data
-                cur.execute("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", 
-                          (key, value))
-            
-            conn.commit()
-            conn.close()
+            # Insert or update fake data
+            with write_transaction(db_path, self.busy_timeout_ms) as conn:
+                conn.executemany("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)", 
+                               fake_entries)
             
+            self.record_database('shield_injected', db_path, len(fake_entries))
             print(f"   💉 Injected fake data into {os.path.basename(db_path)}")
             
         except Exception as e:
             print(f"   ❌ Database injection failed: {str(e)}")
     
+    def encode_snapshot_value(self, value):
+        """Encode an ItemTable value so it survives a JSON round trip"""
+        if isinstance(value, bytes):
+            return {'blob': base64.b64encode(value).decode('ascii')}
+        return {'text': value}
+    
+    def decode_snapshot_value(self, encoded):
+        """Decode a value written by encode_snapshot_value"""
+        if 'blob' in encoded:
+            return base64.b64decode(encoded['blob'])
+        return encoded['text']
+    
     def setup_network_interception(self):
         """Setup network request interception (placeholder)"""
         # This would require more advanced techniques like proxy or DLL injection
@@ -250,6 +240,7 @@ class AugmentPrivacyShield:
             return
         
         print("🔄 Deactivating Augment Privacy Shield...")
+        started = time.perf_counter()
         
         # Restore original environment variables
         for var, value in self.original_env.items():
@@ -265,6 +256,7 @@ class AugmentPrivacyShield:
         self.restore_database_backups()
         
         self.protection_active = False
+        self.record_timing('deactivate', time.perf_counter() - started)
         print("✅ Privacy Shield deactivated. Original system data restored.")
     
     def cleanup_fake_registry(self):
@@ -284,21 +276,41 @@ class AugmentPrivacyShield:
             print("   📁 Cleaned up fake files")
     
     def restore_database_backups(self):
-        """Restore original database backups"""
-        vscode_paths = [
-            os.path.expandvars(r"%APPDATA%\Code\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Code - Insiders\User\globalStorage"),
-            os.path.expandvars(r"%APPDATA%\Cursor\User\globalStorage")
-        ]
-        
-        for vscode_path in vscode_paths:
-            state_db = os.path.join(vscode_path, "state.vscdb")
-            backup_db = state_db + ".shield_backup"
+        """Restore the keys overwritten by the shield from their snapshots"""
+        for _, state_db in shared_discovery().state_databases():
+            if os.path.exists(self.snapshot_path(state_db)):
+                self.restore_database_snapshot(state_db)
+    
+    def restore_database_snapshot(self, db_path):
+        """Put back only the snapshotted rows, in a single transaction"""
+        snapshot_path = self.snapshot_path(db_path)
+        try:
+            with open(snapshot_path, 'r') as f:
+                snapshot = json.load(f)
             
-            if os.path.exists(backup_db):
-                shutil.copy2(backup_db, state_db)
-                os.remove(backup_db)
-                print(f"   💾 Restored {os.path.basename(state_db)}")
+            restored = [(key, self.decode_snapshot_value(value))
+                        for key, value in snapshot['keys'].items() if value is not None]
+            absent = [(key,) for key, value in snapshot['keys'].items() if value is None]
+            
+            with write_transaction(db_path, self.busy_timeout_ms) as conn:
+                conn.executemany("INSERT OR REPLACE INTO ItemTable (key, value) VALUES (?, ?)",
+                                 restored)
+                conn.executemany("DELETE FROM ItemTable WHERE key = ?", absent)
+            
+            os.remove(snapshot_path)
+            self.record_database('shield_restored', db_path, len(snapshot['keys']))
+            print(f"   💾 Restored {len(snapshot['keys'])} keys in {os.path.basename(db_path)}")
+        except Exception as e:
+            print(f"   ❌ Database restore failed: {str(e)}")
+    
+    def record_database(self, category, db_path, keys):
+        if self.results:
+            self.results.add_finding(category, {'database': db_path, 'keys': keys})
+    
+    def record_timing(self, phase, seconds):
+        if self.results:
+            self.results.add_timing(phase, seconds)
+            self.results.flush()
     
     def status_report(self):
         """Show current protection status"""
@@ -316,7 +328,17 @@ class AugmentPrivacyShield:
 
 def main():
     """Main function for privacy shield control"""
-    shield = AugmentPrivacyShield()
+    # --seed N makes the identity pool reproducible
+    seed = None
+    if '--seed' in sys.argv:
+        try:
+            seed = int(sys.argv[sys.argv.index('--seed') + 1])
+        except (IndexError, ValueError):
+            print("Usage: python augment_privacy_shield.py [--seed <integer>] [--no-history]")
+            return
+    
+    results = None if '--no-history' in sys.argv else ResultsStore()
+    shield = AugmentPrivacyShield(results=results, identity_pool=FakeIdentityPool.load(seed=seed))
     
     print("🛡️ Augment Privacy Shield - Fake Data Injection Tool")
     print("=" * 60)
@@ -328,21 +350,26 @@ def main():
         print("\nOptions:")
         print("1. 🛡️ Activate Privacy Shield")
         print("2. 🔄 Deactivate Privacy Shield") 
-        print("3. 📊 Show Status")
-        print("4. 🚪 Exit")
+        print("3. 🔁 Rotate Fake Identity")
+        print("4. 📊 Show Status")
+        print("5. 🚪 Exit")
         
-        choice = input("\nSelect option (1-4): ").strip()
+        choice = input("\nSelect option (1-5): ").strip()
         
         if choice == '1':
             shield.activate_protection()
         elif choice == '2':
             shield.deactivate_protection()
         elif choice == '3':
-            shield.status_report()
+            shield.rotate_identity()
         elif choice == '4':
+            shield.status_report()
+        elif choice == '5':
             if shield.protection_active:
                 print("⚠️ Deactivating protection before exit...")
                 shield.deactivate_protection()
+            if results:
+                results.close()
             print("👋 Goodbye!")
             break
         else:
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY, machine TEXT, tool TEXT, started REAL, finished REAL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id TEXT, machine TEXT, category TEXT, ext_version TEXT, path TEXT, recorded REAL, data TEXT
+);
+CREATE TABLE IF NOT EXISTS cleaned_items (
+    run_id TEXT, machine TEXT, category TEXT, path TEXT, nbytes INTEGER, recorded REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id TEXT, machine TEXT, phase TEXT, seconds REAL, recorded REAL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    run_id TEXT, machine TEXT, name TEXT, value INTEGER, recorded REAL
+);
+CREATE INDEX IF NOT EXISTS findings_machine ON findings (machine, recorded);
+CREATE INDEX IF NOT EXISTS findings_category ON findings (category, recorded);
+CREATE INDEX IF NOT EXISTS findings_version ON findings (ext_version, recorded);
+CREATE INDEX IF NOT EXISTS findings_recorded ON findings (recorded);
+CREATE INDEX IF NOT EXISTS cleaned_machine ON cleaned_items (machine, recorded);
+CREATE INDEX IF NOT EXISTS cleaned_category ON cleaned_items (category, recorded);
+CREATE INDEX IF NOT EXISTS timings_phase ON timings (phase, recorded);
+CREATE INDEX IF NOT EXISTS runs_machine ON runs (machine, started);
+"""
+
+TABLES = ('findings', 'cleaned_items', 'timings', 'counters')
+
+
+def default_results_path():
+    """Results database, kept outside every IDE profile"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'AugmentCleaner', 'results.db')
+
+
+class ResultsStore:
+    """Local SQLite history of scan and clean results
+
+    Rows are buffered in memory and written with executemany in a single
+    WAL-mode transaction per flush, so recording adds almost nothing to a
+    scan. Callers flush at natural boundaries (end of a phase) and when
+    the buffer reaches `batch_size` rows.
+    """
+
+    def __init__(self, path=None, machine=None, batch_size=1000, clock=time.time):
+        self.path = path or default_results_path()
+        # The OS host name, not %COMPUTERNAME%, which the privacy shield fakes
+        self.machine = machine or socket.gethostname()
+        self.batch_size = batch_size
+        self.clock = clock
+        self.run_id = None
+        self.pending = {table: [] for table in TABLES}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def start_run(self, tool):
+        """Begin a new run, returning its id"""
+        self.run_id = uuid.uuid4().hex
+        with self.conn:
+            self.conn.execute("INSERT INTO runs (run_id, machine, tool, started) VALUES (?, ?, ?, ?)",
+                              (self.run_id, self.machine, tool, self.clock()))
+        return self.run_id
+
+    def finish_run(self):
+        """Flush buffered rows and mark the current run finished"""
+        self.flush()
+        if self.run_id:
+            with self.conn:
+                self.conn.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (self.clock(), self.run_id))
+            self.run_id = None
+
+    def add(self, table, row):
+        if self.run_id is None:
+            self.start_run(os.path.basename(sys.argv[0]) or 'python')
+        self.pending[table].append((self.run_id, self.machine) + row + (self.clock(),))
+        if sum(len(rows) for rows in self.pending.values()) >= self.batch_size:
+            self.flush()
+
+    def add_finding(self, category, finding, ext_version=None):
+        path = finding.get('path') or finding.get('database')
+        data = json.dumps(finding, default=str)
+        self.add('findings', (category, ext_version, path, data))
+
+    def add_cleaned(self, category, path, nbytes=None):
+        self.add('cleaned_items', (category, path, nbytes))
+
+    def add_timing(self, phase, seconds):
+        self.add('timings', (phase, seconds))
+
+    def add_counter(self, name, value):
+        self.add('counters', (name, value))
+
+    def flush(self):
+        """Write every buffered row in one transaction"""
+        if not any(self.pending.values()):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO findings (run_id, machine, category, ext_version, path, data, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", self.pending['findings'])
+            self.conn.executemany(
+                "INSERT INTO cleaned_items (run_id, machine, category, path, nbytes, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?)", self.pending['cleaned_items'])
+            self.conn.executemany(
+                "INSERT INTO timings (run_id, machine, phase, seconds, recorded) VALUES (?, ?, ?, ?, ?)",
+                self.pending['timings'])
+            self.conn.executemany(
+                "INSERT INTO counters (run_id, machine, name, value, recorded) VALUES (?, ?, ?, ?, ?)",
+                self.pending['counters'])
+        for rows in self.pending.values():
+            rows.clear()
+
+    def versions_seen_since(self, since):
+        """(version, machine count, first seen, last seen) for Augment extensions found since a time"""
+        return self.conn.execute(
+            "SELECT ext_version, COUNT(DISTINCT machine), MIN(recorded), MAX(recorded) FROM findings "
+            "WHERE category = 'extensions' AND recorded >= ? AND ext_version IS NOT NULL "
+            "GROUP BY ext_version ORDER BY ext_version", (since,)).fetchall()
+
+    def merge(self, other_path):
+        """Import the runs of another machine's results database
+
+        Runs already present are skipped, so merging the same file twice
+        does not duplicate rows.
+        """
+        self.flush()
+        self.conn.execute("ATTACH DATABASE ? AS other", (other_path,))
+        try:
+            with self.conn:
+                self.conn.execute("CREATE TEMP TABLE new_runs AS SELECT run_id FROM other.runs "
+                                  "WHERE run_id NOT IN (SELECT run_id FROM main.runs)")
+                for table in TABLES:
+                    self.conn.execute(f"INSERT INTO main.{table} SELECT * FROM other.{table} "
+                                      f"WHERE run_id IN (SELECT run_id FROM temp.new_runs)")
+                self.conn.execute("INSERT INTO main.runs SELECT * FROM other.runs "
+                                  "WHERE run_id IN (SELECT run_id FROM temp.new_runs)")
+                merged = self.conn.execute("SELECT COUNT(*) FROM temp.new_runs").fetchone()[0]
+                self.conn.execute("DROP TABLE temp.new_runs")
+        finally:
+            self.conn.execute("DETACH DATABASE other")
+        return merged
+
+    def close(self):
+        self.finish_run()
+        self.conn.close()
+
+
+def main():
+    """Query or merge the results history"""
+    args = sys.argv[1:]
+    store = ResultsStore()
+    try:
+        if args and args[0] == 'versions':
+            days = float(args[1]) if len(args) > 1 else 7
+            rows = store.versions_seen_since(time.time() - days * 86400)
+            print(f"📦 Augment versions seen in the last {days:g} day(s):")
+            for version, machines, first_seen, last_seen in rows:
+                print(f"   v{version}: {machines} machine(s), first {time.ctime(first_seen)}, last {time.ctime(last_seen)}")
+        elif len(args) >= 2 and args[0] == 'merge':
+            for other_path in args[1:]:
+                print(f"📥 Merged {store.merge(other_path)} run(s) from {other_path}")
+        else:
+            print("Usage:")
+            print("  python augment_results_store.py versions [days]")
+            print("  python augment_results_store.py merge <results.db> [...]")
+    finally:
+        store.conn.close()
+
+
+if __name__ == "__main__":
+    main()
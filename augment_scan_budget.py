@@ -0,0 +1,49 @@
+import time
+
+
+class ScanBudget:
+    """Overall and per-phase time budgets for a scan
+
+    Scanners check exhausted() between work units and stop early, leaving
+    a resumption cursor behind. `phase_seconds` is either one limit for
+    every phase or a {phase name: seconds} dict; phases missing from the
+    dict are only bound by the overall budget.
+    """
+
+    def __init__(self, total_seconds=None, phase_seconds=None, clock=time.monotonic):
+        self.total_seconds = total_seconds
+        self.phase_seconds = phase_seconds
+        self.clock = clock
+        self.started = None
+        self.phase_started = None
+        self.phase_limit = None
+
+    def start(self):
+        self.started = self.clock()
+
+    def start_phase(self, name):
+        if self.started is None:
+            self.start()
+        self.phase_started = self.clock()
+        if isinstance(self.phase_seconds, dict):
+            self.phase_limit = self.phase_seconds.get(name)
+        else:
+            self.phase_limit = self.phase_seconds
+
+    def remaining(self):
+        """Seconds left before the nearest deadline, or None if unbounded"""
+        now = self.clock()
+        limits = []
+        if self.total_seconds is not None and self.started is not None:
+            limits.append(self.total_seconds - (now - self.started))
+        if self.phase_limit is not None and self.phase_started is not None:
+            limits.append(self.phase_limit - (now - self.phase_started))
+        return min(limits) if limits else None
+
+    def exhausted(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def overall_exhausted(self):
+        return (self.total_seconds is not None and self.started is not None
+                and self.clock() - self.started >= self.total_seconds)
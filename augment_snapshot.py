@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+
+from augment_ide_discovery import shared_discovery
+from augment_sqlite import connect_readonly
+
+SNAPSHOT_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+
+def digest(*parts):
+    """Short hex digest of a sequence of str/bytes parts"""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def tree_node(node_type, children):
+    """Build an interior node whose hash covers its children's names and hashes"""
+    parts = []
+    for name in sorted(children):
+        parts.extend((name, children[name]['hash']))
+    return {'type': node_type, 'hash': digest(node_type, *parts), 'children': children}
+
+
+def unreadable_node(error):
+    """Leaf standing in for something that could not be read"""
+    return {'type': 'unreadable', 'hash': digest('unreadable'), 'error': str(error)}
+
+
+class SnapshotBuilder:
+    """Builds Merkle-tree snapshots of the places Augment writes to
+
+    Files hash their content, directories hash their children, and each
+    ItemTable is split into 256 buckets (by key hash) of per-row digests.
+    When a previous snapshot is supplied, files whose size and mtime are
+    unchanged reuse its content hash instead of being read again.
+    """
+
+    def __init__(self, previous=None, discovery=None):
+        self.previous = previous
+        self.discovery = discovery or shared_discovery()
+
+    def build(self):
+        """Snapshot extensions, Augment data folders, workspace storage and databases"""
+        extensions = {}
+        for extension_root in self.discovery.extension_roots():
+            entries = {}
+            for name in sorted(os.listdir(extension_root['path'])):
+                if 'augment' in name.lower():
+                    node = self.snapshot_path(os.path.join(extension_root['path'], name),
+                                              ('extensions', extension_root['ide'], name))
+                    if node:
+                        entries[name] = node
+            extensions[extension_root['ide']] = tree_node('dir', entries)
+
+        augment_data = {}
+        for label, variable in (('LOCALAPPDATA', 'LOCALAPPDATA'), ('APPDATA', 'APPDATA'), ('TEMP', 'TEMP')):
+            base = os.environ.get(variable)
+            if base and os.path.isdir(os.path.join(base, 'Augment')):
+                augment_data[label] = self.snapshot_path(os.path.join(base, 'Augment'),
+                                                         ('augment_data', label))
+
+        workspaces = {}
+        databases = {}
+        for ide in self.discovery.ides():
+            if os.path.isdir(ide['workspace_storage']):
+                workspaces[ide['name']] = self.snapshot_path(ide['workspace_storage'],
+                                                             ('workspace_storage', ide['name']))
+            if ide['state_db'] and os.path.exists(ide['state_db']):
+                databases[ide['name']] = self.snapshot_item_table(ide['state_db'])
+
+        root = tree_node('dir', {
+            'extensions': tree_node('dir', extensions),
+            'augment_data': tree_node('dir', {k: v for k, v in augment_data.items() if v}),
+            'workspace_storage': tree_node('dir', {k: v for k, v in workspaces.items() if v}),
+            'databases': tree_node('dir', databases),
+        })
+        return {'version': SNAPSHOT_VERSION, 'created': datetime.now().isoformat(), 'root': root}
+
+    def previous_node(self, tree_path):
+        """Node at the same path in the previous snapshot, if any"""
+        node = self.previous['root'] if self.previous else None
+        for name in tree_path:
+            if not node or 'children' not in node:
+                return None
+            node = node['children'].get(name)
+        return node
+
+    def snapshot_path(self, path, tree_path):
+        """Snapshot a file or directory, returning None if it cannot be read"""
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                children = {}
+                for entry in os.scandir(path):
+                    if entry.is_symlink():
+                        continue
+                    node = self.snapshot_path(entry.path, tree_path + (entry.name,))
+                    if node:
+                        children[entry.name] = node
+                return tree_node('dir', children)
+            return self.snapshot_file(path, tree_path)
+        except OSError:
+            return None
+
+    def snapshot_file(self, path, tree_path):
+        stat = os.stat(path)
+        previous = self.previous_node(tree_path)
+        if (previous and previous['type'] == 'file' and previous['size'] == stat.st_size
+                and previous['mtime'] == stat.st_mtime_ns):
+            content_hash = previous['hash']
+        else:
+            h = hashlib.sha1()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                    h.update(chunk)
+            content_hash = h.hexdigest()
+        return {'type': 'file', 'hash': content_hash, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    def snapshot_item_table(self, db_path):
+        """Bucketed row digests for an ItemTable
+        
+        A database that is locked or corrupt gets an 'unreadable' node, so
+        a diff reports it once rather than as every row being removed.
+        """
+        buckets = {}
+        try:
+            conn = connect_readonly(db_path)
+        except sqlite3.Error as e:
+            return unreadable_node(e)
+        try:
+            for key, value in conn.execute("SELECT key, value FROM ItemTable"):
+                bucket = buckets.setdefault(digest(key)[:2], {})
+                bucket[key] = digest(key, value if value is not None else b'')[:16]
+        except sqlite3.Error as e:
+            return unreadable_node(e)
+        finally:
+            conn.close()
+
+        children = {}
+        for name, rows in buckets.items():
+            parts = []
+            for key in sorted(rows):
+                parts.extend((key, rows[key]))
+            children[name] = {'type': 'bucket', 'hash': digest('bucket', *parts), 'rows': rows}
+        return tree_node('table', children)
+
+
+def diff_snapshots(old, new):
+    """List (change, path) tuples between two snapshots
+
+    Subtrees with equal hashes are skipped without being visited, so the
+    walk is proportional to the number of changes rather than the size of
+    the snapshots.
+    """
+    changes = []
+    diff_nodes(old['root'], new['root'], (), changes)
+    return changes
+
+
+def diff_nodes(old, new, path, changes):
+    if old is None:
+        collect_leaves(new, path, 'added', changes)
+        return
+    if new is None:
+        collect_leaves(old, path, 'removed', changes)
+        return
+    if 'unreadable' in (old['type'], new['type']):
+        # Nothing is known about the contents on the unreadable side
+        changes.append(('unreadable', path))
+        return
+    if old['hash'] == new['hash']:
+        return
+
+    if old['type'] != new['type'] or old['type'] == 'file':
+        changes.append(('changed', path))
+        return
+
+    if old['type'] == 'bucket':
+        for key in sorted(old['rows'].keys() | new['rows'].keys()):
+            before, after = old['rows'].get(key), new['rows'].get(key)
+            if before != after:
+                change = 'added' if before is None else 'removed' if after is None else 'changed'
+                changes.append((change, path + (key,)))
+        return
+
+    for name in sorted(old['children'].keys() | new['children'].keys()):
+        # Table buckets are an internal detail, so they are left out of the path
+        child_path = path if old['type'] == 'table' else path + (name,)
+        diff_nodes(old['children'].get(name), new['children'].get(name), child_path, changes)
+
+
+def collect_leaves(node, path, change, changes):
+    """Report every file or row in an added or removed subtree"""
+    if node['type'] in ('file', 'unreadable'):
+        changes.append((change, path))
+    elif node['type'] == 'bucket':
+        changes.extend((change, path + (key,)) for key in sorted(node['rows']))
+    else:
+        for name in sorted(node['children']):
+            child_path = path if node['type'] == 'table' else path + (name,)
+            collect_leaves(node['children'][name], child_path, change, changes)
+
+
+def load_snapshot(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_snapshot(snapshot, path):
+    with open(path, 'w') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+
+
+def main():
+    """Command line entry point: snapshot or diff"""
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == 'snapshot':
+        previous = load_snapshot(args[2]) if len(args) > 2 and os.path.exists(args[2]) else None
+        snapshot = SnapshotBuilder(previous).build()
+        save_snapshot(snapshot, args[1])
+        print(f"📸 Snapshot saved to {args[1]}")
+    elif len(args) == 3 and args[0] == 'diff':
+        changes = diff_snapshots(load_snapshot(args[1]), load_snapshot(args[2]))
+        icons = {'added': '➕', 'removed': '➖', 'changed': '✏️', 'unreadable': '⚠️'}
+        for change, path in changes:
+            print(f"   {icons[change]} {change}: {' / '.join(path)}")
+        print(f"📊 {len(changes)} change(s) since {args[1]}")
+    else:
+        print("Usage:")
+        print("  python augment_snapshot.py snapshot <out.json> [previous.json]")
+        print("  python augment_snapshot.py diff <old.json> <new.json>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import pathlib
+from contextlib import contextmanager
+
+# How long to wait for the IDE to release a lock before giving up
+DEFAULT_BUSY_TIMEOUT_MS = 2000
+
+
+def readonly_uri(path):
+    """SQLite URI that opens a database file read-only"""
+    return pathlib.Path(os.path.abspath(path)).as_uri() + '?mode=ro'
+
+
+def connect_readonly(path, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+    """Open a read-only, query_only connection that waits politely on locks
+
+    A read-only handle never takes a write lock, so scans cannot make the
+    IDE wait on its own writes.
+    """
+    conn = sqlite3.connect(readonly_uri(path), uri=True, timeout=busy_timeout_ms / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+@contextmanager
+def write_transaction(path, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+    """Run a short BEGIN IMMEDIATE transaction, committing on success
+
+    Taking the write lock up front means the transaction either starts with
+    the lock or waits for it, instead of failing halfway through when it
+    tries to upgrade a read lock held alongside the IDE.
+    """
+    conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+class ConnectionPool:
+    """Read-only connections shared by everything in one run
+
+    Statements run in autocommit mode, so a pooled connection holds no lock
+    between queries and always sees the latest committed data.
+    """
+
+    def __init__(self, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+        self.busy_timeout_ms = busy_timeout_ms
+        self.connections = {}
+
+    def get(self, path):
+        key = os.path.normcase(os.path.abspath(path))
+        conn = self.connections.get(key)
+        if conn is None:
+            conn = connect_readonly(path, self.busy_timeout_ms)
+            self.connections[key] = conn
+        return conn
+
+    def close_all(self):
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
@@ -0,0 +1,119 @@
+"""Benchmark scan latency against a state.vscdb that an "IDE" keeps writing to.
+
+A writer thread plays the IDE, committing small INSERT OR REPLACE
+transactions in a loop. The main thread runs the deep-scan queries either
+through a fresh plain read-write connection per scan (the old behaviour) or
+through a pooled read-only, query_only connection. Both scan latency and
+the writer's commit latency are reported, since a scan that makes the IDE
+wait is as bad as a slow scan.
+
+    python bench_sqlite_concurrency.py [rows] [scans] [--wal]
+"""
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import threading
+
+from augment_sqlite import ConnectionPool, DEFAULT_BUSY_TIMEOUT_MS
+
+PATTERNS = [
+    '%username%', '%user%', '%computer%', '%machine%', '%email%',
+    '%identity%', '%profile%', '%account%', '%name%', '%domain%', '%devuser%'
+]
+
+
+def create_database(path, rows, wal):
+    conn = sqlite3.connect(path)
+    if wal:
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)",
+                     ((f"ext.setting.{i}", f"value {i} for devuser") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def ide_writer(path, stop, latencies, errors):
+    """Commit a small write every few milliseconds, like an IDE saving state"""
+    conn = sqlite3.connect(path, timeout=DEFAULT_BUSY_TIMEOUT_MS / 1000)
+    i = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.execute("INSERT OR REPLACE INTO ItemTable VALUES (?, ?)", (f"ide.key.{i % 100}", str(i)))
+            conn.commit()
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors.append(i)
+            conn.rollback()
+        i += 1
+        time.sleep(0.002)
+    conn.close()
+
+
+def scan(conn):
+    cur = conn.cursor()
+    for pattern in PATTERNS:
+        cur.execute("SELECT key, value FROM ItemTable WHERE LOWER(key) LIKE ? OR LOWER(value) LIKE ?",
+                    (pattern, pattern))
+        cur.fetchall()
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(path, scans, mode):
+    stop = threading.Event()
+    writer_latencies, writer_errors = [], []
+    writer = threading.Thread(target=ide_writer, args=(path, stop, writer_latencies, writer_errors))
+    writer.start()
+
+    pool = ConnectionPool()
+    scan_latencies, scan_errors = [], 0
+    try:
+        for _ in range(scans):
+            started = time.perf_counter()
+            try:
+                if mode == 'plain':
+                    conn = sqlite3.connect(path)
+                    scan(conn)
+                    conn.close()
+                else:
+                    scan(pool.get(path))
+                scan_latencies.append(time.perf_counter() - started)
+            except sqlite3.OperationalError:
+                scan_errors += 1
+    finally:
+        stop.set()
+        writer.join()
+        pool.close_all()
+
+    ms = 1000
+    print(f"{mode:>9}  scan p50 {percentile(scan_latencies, 0.5) * ms:8.2f} ms"
+          f"  p99 {percentile(scan_latencies, 0.99) * ms:8.2f} ms  errors {scan_errors:3d}"
+          f"  | IDE write p50 {percentile(writer_latencies, 0.5) * ms:7.2f} ms"
+          f"  p99 {percentile(writer_latencies, 0.99) * ms:8.2f} ms  errors {len(writer_errors)}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    rows = int(args[0]) if args else 50000
+    scans = int(args[1]) if len(args) > 1 else 20
+    wal = '--wal' in sys.argv
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'state.vscdb')
+        create_database(path, rows, wal)
+        print(f"ItemTable rows: {rows}, scans: {scans}, journal: {'WAL' if wal else 'rollback'}")
+        for mode in ('plain', 'read-only'):
+            run(path, scans, mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The tools import winreg at module level; the tests never touch the
+# registry, so an empty module is enough off Windows.
+if sys.platform != 'win32':
+    sys.modules.setdefault('winreg', types.ModuleType('winreg'))
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from augment_background_scan import BackgroundScanScheduler, IOThrottle, TokenBucket
+from augment_cleaner_v2 import AugmentCleanerV2
+from augment_results_store import ResultsStore
+
+
+class FakeTime:
+    """Clock that advances `step` seconds per read, plus whatever is slept"""
+
+    def __init__(self, step=0.0):
+        self.now = 1000.0
+        self.step = step
+        self.slept = []
+
+    def clock(self):
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class ExtensionsOnly:
+    def __init__(self, extensions_dir):
+        self.extensions_dir = extensions_dir
+
+    def extension_roots(self):
+        return [{'ide': 'VSCode', 'path': self.extensions_dir}]
+
+    def state_databases(self):
+        return []
+
+    def ides(self):
+        return []
+
+
+@pytest.fixture
+def discovery(tmp_path, monkeypatch):
+    for var in ('LOCALAPPDATA', 'APPDATA', 'TEMP'):
+        monkeypatch.setenv(var, str(tmp_path / var.lower()))
+    extensions_dir = tmp_path / 'extensions'
+    for version in ('0.500.0', '0.501.0', '0.502.0'):
+        (extensions_dir / f'augment.vscode-augment-{version}').mkdir(parents=True)
+    return ExtensionsOnly(str(extensions_dir))
+
+
+def make_scheduler(tmp_path, discovery, fake, **options):
+    options.setdefault('results_factory', None)
+    options.setdefault('tick_budget', 5)
+    return BackgroundScanScheduler(
+        state_path=str(tmp_path / 'background_scan.json'), interval=3600,
+        bytes_per_sec=None, files_per_sec=None, unit_pause=0.1,
+        cleaner_factory=lambda: AugmentCleanerV2(discovery=discovery),
+        clock=fake.clock, sleep=fake.sleep, **options)
+
+
+def test_token_bucket_allows_its_capacity_then_asks_for_a_wait():
+    fake = FakeTime()
+    bucket = TokenBucket(100, clock=fake.clock)
+    assert bucket.take(100) == 0.0
+    assert bucket.take(50) == pytest.approx(0.5)
+    # A second refills 100 tokens, of which 50 pay off the debt
+    fake.now += 1.0
+    assert bucket.take(50) == 0.0
+    assert bucket.take(25) == pytest.approx(0.25)
+
+
+def test_throttle_sleeps_bytes_over_rate_once_the_bucket_is_empty():
+    fake = FakeTime()
+    throttle = IOThrottle(bytes_per_sec=1000, files_per_sec=10, clock=fake.clock, sleep=fake.sleep)
+
+    throttle.consume(files=1, nbytes=1000)
+    assert fake.slept == []
+
+    throttle.consume(files=1, nbytes=500)
+    assert fake.slept == [pytest.approx(0.5)]
+
+    # The sleep refilled the bucket just enough for the previous debt
+    throttle.consume(nbytes=250)
+    assert fake.slept[-1] == pytest.approx(0.25)
+    assert throttle.throttled_seconds == pytest.approx(0.75)
+
+
+def test_ticks_resume_until_a_scan_completes(tmp_path, discovery):
+    fake = FakeTime(step=1.0)
+    scheduler = make_scheduler(tmp_path, discovery, fake)
+
+    ticks = 1
+    while not scheduler.tick():
+        ticks += 1
+        assert ticks < 100
+        state = json.load(open(scheduler.state_path))
+        assert state['cycle'] is not None and state['last_completed'] is None
+
+    assert ticks > 1
+    state = scheduler.load_state()
+    assert state['cycle'] is None
+    assert [ext['version'] for ext in state['last_findings']['extensions']] == ['0.500.0', '0.501.0', '0.502.0']
+    assert 0.1 in fake.slept
+
+
+def test_next_scan_waits_for_the_interval(tmp_path, discovery):
+    fake = FakeTime()
+    scheduler = make_scheduler(tmp_path, discovery, fake, tick_budget=None)
+
+    assert scheduler.tick()
+    completed = scheduler.load_state()['last_completed']
+
+    fake.now = completed + 3599
+    assert not scheduler.is_due(scheduler.load_state())
+    assert not scheduler.tick()
+    assert scheduler.load_state()['last_completed'] == completed
+
+    fake.now = completed + 3600
+    assert scheduler.is_due(scheduler.load_state())
+    assert scheduler.tick()
+    assert scheduler.load_state()['last_completed'] > completed
+
+
+def test_each_tick_records_into_the_results_store(tmp_path, discovery):
+    fake = FakeTime(step=1.0)
+    results_path = str(tmp_path / 'results.db')
+    scheduler = make_scheduler(tmp_path, discovery, fake,
+                               results_factory=lambda: ResultsStore(results_path, clock=fake.clock))
+
+    ticks = 1
+    while not scheduler.tick():
+        ticks += 1
+
+    store = ResultsStore(results_path)
+    runs = store.conn.execute("SELECT COUNT(*) FROM runs WHERE finished IS NOT NULL").fetchone()[0]
+    versions = [row[0] for row in store.versions_seen_since(0)]
+    store.conn.close()
+    assert runs == ticks
+    assert versions == ['0.500.0', '0.501.0', '0.502.0']
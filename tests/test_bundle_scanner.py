@@ -0,0 +1,91 @@
+import pytest
+
+import augment_bundle_scanner
+from augment_bundle_scanner import BundleScanner, MMAP_THRESHOLD, endpoint_hostnames
+
+BUNDLE = (
+    b'const api = "https://api.augmentcode.com/v1/completions?x=1";\n'
+    b'const docs = "https://www.w3.org/2000/svg";\n'
+    b'send("telemetry.augmentcode.com", {"machineId": id, sessionId: s});\n'
+    b'track({"userEmail": email, "eventAnalyticsEnabled": true});\n'
+)
+
+
+class IOCounter:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+
+    def __call__(self, files=0, nbytes=0):
+        self.files += files
+        self.bytes += nbytes
+
+
+def make_extension(tmp_path, name, bundles):
+    extension = tmp_path / name
+    (extension / 'node_modules' / 'dep').mkdir(parents=True)
+    (extension / 'node_modules' / 'dep' / 'index.js').write_bytes(b'"https://ignored.example.net"')
+    (extension / 'package.json').write_bytes(b'"https://not-a-bundle.example.net"')
+    for file_name, content in bundles.items():
+        (extension / 'out').mkdir(exist_ok=True)
+        (extension / 'out' / file_name).write_bytes(content)
+    return str(extension)
+
+
+def test_bundle_pattern_finds_urls_hosts_and_telemetry_keys(tmp_path):
+    scanner = BundleScanner(str(tmp_path / 'cache.json'))
+    path = make_extension(tmp_path, 'augment.vscode-augment-0.500.0', {'extension.js': BUNDLE})
+
+    analysis = scanner.analyse_extension(path, 'augment.vscode-augment-0.500.0')
+
+    assert analysis['urls'] == ['https://api.augmentcode.com/v1/completions?x=1',
+                                'https://www.w3.org/2000/svg']
+    assert analysis['hostnames'] == ['api.augmentcode.com', 'telemetry.augmentcode.com', 'www.w3.org']
+    assert analysis['telemetry_keys'] == ['eventAnalyticsEnabled', 'machineId', 'userEmail']
+    assert analysis['files_scanned'] == 1
+    assert endpoint_hostnames(analysis) == ['api.augmentcode.com', 'telemetry.augmentcode.com']
+
+
+def test_large_bundles_are_memory_mapped(tmp_path, monkeypatch):
+    padding = b' ' * MMAP_THRESHOLD
+    path = make_extension(tmp_path, 'augment.vscode-augment-0.501.0', {
+        'small.js': BUNDLE,
+        'large.js': padding + b'fetch("https://large.augmentcode.com/x")'
+    })
+
+    mapped = []
+    real_mmap = augment_bundle_scanner.mmap.mmap
+
+    def recording_mmap(fileno, length, **kwargs):
+        data = real_mmap(fileno, length, **kwargs)
+        mapped.append(len(data))
+        return data
+
+    monkeypatch.setattr(augment_bundle_scanner.mmap, 'mmap', recording_mmap)
+    analysis = BundleScanner(str(tmp_path / 'cache.json')).analyse_extension(path, 'augment.vscode-augment-0.501.0')
+
+    assert mapped == [MMAP_THRESHOLD + len(b'fetch("https://large.augmentcode.com/x")')]
+    assert 'large.augmentcode.com' in analysis['hostnames']
+    assert 'api.augmentcode.com' in analysis['hostnames']
+    assert analysis['files_scanned'] == 2
+
+
+@pytest.mark.parametrize('reload_cache', [False, True])
+def test_each_version_is_analysed_once(tmp_path, reload_cache):
+    cache_path = str(tmp_path / 'cache.json')
+    path = make_extension(tmp_path, 'augment.vscode-augment-0.502.0', {'extension.js': BUNDLE})
+    io = IOCounter()
+    scanner = BundleScanner(cache_path, io_hook=io)
+
+    first = scanner.analyse_extension(path, 'augment.vscode-augment-0.502.0')
+    assert io.files == 1 and io.bytes == len(BUNDLE)
+
+    if reload_cache:
+        scanner = BundleScanner(cache_path, io_hook=io)
+    assert scanner.analyse_extension(path, 'augment.vscode-augment-0.502.0') == first
+    assert io.files == 1
+
+    # A new version is a new folder name and is analysed again
+    other = make_extension(tmp_path, 'augment.vscode-augment-0.503.0', {'extension.js': BUNDLE})
+    scanner.analyse_extension(other, 'augment.vscode-augment-0.503.0')
+    assert io.files == 2
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from augment_db_index import ItemTableIndex
+
+
+@pytest.fixture
+def state_db(tmp_path):
+    path = str(tmp_path / 'state.vscdb')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)",
+                     [('a', 'plain'), ('b', 'plain'), ('c', 'username=alice')])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def write(path, *statements):
+    conn = sqlite3.connect(path)
+    for statement, params in statements:
+        conn.execute(statement, params)
+    conn.commit()
+    conn.close()
+
+
+def test_refresh_picks_up_new_and_replaced_rows(state_db, tmp_path):
+    index = ItemTableIndex(state_db, str(tmp_path / 'index'))
+    index.refresh()
+    assert index.match('%username%') == [('c', 'username=alice')]
+
+    write(state_db, ("INSERT INTO ItemTable VALUES (?, ?)", ('a', 'username=bob')))
+    index.refresh(sqlite3.connect(state_db))
+    assert sorted(index.match('%username%')) == [('a', 'username=bob'), ('c', 'username=alice')]
+
+
+def test_refresh_notices_a_reused_rowid(state_db, tmp_path):
+    index = ItemTableIndex(state_db, str(tmp_path / 'index'))
+    index.refresh()
+
+    # Deleting the max-rowid row lets the next insert reuse its rowid
+    write(state_db, ("DELETE FROM ItemTable WHERE key = ?", ('c',)),
+          ("INSERT INTO ItemTable VALUES (?, ?)", ('d', 'nothing here')))
+    assert sqlite3.connect(state_db).execute(
+        "SELECT rowid FROM ItemTable WHERE key = 'd'").fetchone()[0] == 3
+
+    index.refresh(sqlite3.connect(state_db))
+    assert index.match('%username%') == []
+    assert index.match('%nothing%') == [('d', 'nothing here')]
+
+
+def test_refresh_notices_a_reinserted_top_row(state_db, tmp_path):
+    write(state_db, ("UPDATE ItemTable SET value = ? WHERE key = ?", ('x' * len('username=alice'), 'c')))
+    index = ItemTableIndex(state_db, str(tmp_path / 'index'))
+    index.refresh()
+    assert index.match('%username%') == []
+
+    # Same key, same reused rowid and same value length; only the value differs
+    write(state_db, ("DELETE FROM ItemTable WHERE key = ?", ('c',)),
+          ("INSERT INTO ItemTable VALUES (?, ?)", ('c', 'username=alice')))
+    assert sqlite3.connect(state_db).execute(
+        "SELECT rowid FROM ItemTable WHERE key = 'c'").fetchone()[0] == 3
+    index.refresh(sqlite3.connect(state_db))
+    assert index.match('%username%') == [('c', 'username=alice')]
+
+
+def test_refresh_notices_a_same_rowid_value_of_another_length(state_db, tmp_path):
+    index = ItemTableIndex(state_db, str(tmp_path / 'index'))
+    index.refresh()
+
+    write(state_db, ("UPDATE ItemTable SET value = ? WHERE key = ?", ('username=bob', 'a')))
+    index.refresh(sqlite3.connect(state_db))
+    assert sorted(index.match('%username%')) == [('a', 'username=bob'), ('c', 'username=alice')]
+
+
+def test_index_from_before_the_size_marker_is_rebuilt(state_db, tmp_path):
+    index_dir = str(tmp_path / 'index')
+    index = ItemTableIndex(state_db, index_dir)
+    index.conn.execute("DROP TABLE rows")
+    index.conn.execute("CREATE TABLE rows (rowid INTEGER PRIMARY KEY, key TEXT)")
+    index.conn.commit()
+    index.close()
+
+    index = ItemTableIndex(state_db, index_dir)
+    assert index.refresh() == 3
+    assert index.match('%username%') == [('c', 'username=alice')]
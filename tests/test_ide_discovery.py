@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from augment_ide_discovery import IDEDiscovery
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / 'home'
+    (home / '.config' / 'Code' / 'User' / 'globalStorage').mkdir(parents=True)
+    (home / '.config' / 'Code' / 'User' / 'globalStorage' / 'state.vscdb').write_bytes(b'')
+    (home / '.vscode' / 'extensions').mkdir(parents=True)
+    monkeypatch.setenv('HOME', str(home))
+    monkeypatch.delenv('APPDATA', raising=False)
+    monkeypatch.delenv('XDG_CONFIG_HOME', raising=False)
+    return home
+
+
+def test_discovers_state_databases_and_extension_roots(home, tmp_path):
+    discovery = IDEDiscovery(str(tmp_path / 'cache.json'))
+
+    assert discovery.state_databases() == [
+        ('VSCode', str(home / '.config' / 'Code' / 'User' / 'globalStorage' / 'state.vscdb'))]
+    assert discovery.extension_roots() == [{'ide': 'VSCode (User)', 'path': str(home / '.vscode' / 'extensions')}]
+
+
+def test_dotfile_churn_in_home_keeps_the_cache(home, tmp_path):
+    cache_path = str(tmp_path / 'cache.json')
+    IDEDiscovery(cache_path).get_roots()
+    cache = json.load(open(cache_path))
+
+    (home / '.bash_history').write_text('ls')
+    os.rename(home / '.bash_history', home / '.bash_history.old')
+    assert IDEDiscovery(cache_path).is_valid(cache)
+
+    # A newly created ~/.<ide> folder is noticed
+    (home / '.cursor' / 'extensions').mkdir(parents=True)
+    assert not IDEDiscovery(cache_path).is_valid(cache)
+    assert {'ide': 'Cursor (User)', 'path': str(home / '.cursor' / 'extensions')} in \
+        IDEDiscovery(cache_path).extension_roots()
+
+
+def test_cache_without_watched_entries_is_stale(home, tmp_path):
+    cache_path = tmp_path / 'cache.json'
+    cache_path.write_text(json.dumps({'ides': [], 'extension_roots': []}))
+
+    discovery = IDEDiscovery(str(cache_path))
+    assert not discovery.is_valid(json.loads(cache_path.read_text()))
+    assert discovery.state_databases()
@@ -0,0 +1,70 @@
+import os
+
+from augment_cleaner_v2 import AugmentCleanerV2
+
+
+class NoDiscovery:
+    def extension_roots(self):
+        return []
+
+    def state_databases(self):
+        return []
+
+    def ides(self):
+        return []
+
+
+def make_tree(base, paths):
+    for path in paths:
+        full = os.path.join(base, *path.split('/'))
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w') as f:
+            f.write('x')
+
+
+def relative(base_paths, cursor, path):
+    return os.path.relpath(path, base_paths[cursor[0]]).replace(os.sep, '/')
+
+
+def test_files_sort_before_subfolders_and_cursors_ascend(tmp_path):
+    base_paths = [str(tmp_path / 'one'), str(tmp_path / 'missing'), str(tmp_path / 'two')]
+    make_tree(base_paths[0], ['z.txt', 'a/b.txt', 'a/a/c.txt', 'b/d.txt'])
+    make_tree(base_paths[2], ['e.txt'])
+
+    cleaner = AugmentCleanerV2(discovery=NoDiscovery())
+    walked = list(cleaner.iter_files(base_paths))
+
+    assert [relative(base_paths, cursor, path) for cursor, path in walked] == [
+        'z.txt', 'a/b.txt', 'a/a/c.txt', 'b/d.txt', 'e.txt']
+    cursors = [cursor for cursor, _ in walked]
+    assert cursors == sorted(cursors)
+    assert cursors[-1][0] == 2
+
+
+def test_resume_skips_and_prunes_folders_before_the_cursor(tmp_path):
+    base_paths = [str(tmp_path / 'one'), str(tmp_path / 'two')]
+    make_tree(base_paths[0], ['z.txt', 'a/1.txt', 'a/2.txt', 'a/a/3.txt', 'b/4.txt', 'b/5.txt', 'c/6.txt'])
+    make_tree(base_paths[1], ['7.txt'])
+
+    cleaner = AugmentCleanerV2(discovery=NoDiscovery())
+    walked = list(cleaner.iter_files(base_paths))
+    resume = next(cursor for cursor, path in walked if path.endswith('4.txt'))
+
+    cleaner.io_counters['files'] = 0
+    resumed = [(cursor, path) for cursor, path in cleaner.iter_files(base_paths, resume)
+               if cursor > resume]
+
+    assert [os.path.basename(path) for _, path in resumed] == ['5.txt', '6.txt', '7.txt']
+    # Folder 'a' and its subfolder lie wholly before the cursor and are not listed again
+    assert cleaner.io_counters['files'] == len(['z.txt', '4.txt', '5.txt', '6.txt', '7.txt'])
+
+
+def test_resume_in_a_later_base_path_skips_earlier_ones(tmp_path):
+    base_paths = [str(tmp_path / 'one'), str(tmp_path / 'two')]
+    make_tree(base_paths[0], ['a.txt'])
+    make_tree(base_paths[1], ['b.txt', 'c.txt'])
+
+    cleaner = AugmentCleanerV2(discovery=NoDiscovery())
+    resume = [1, '0b.txt']
+    assert [os.path.basename(path) for cursor, path in cleaner.iter_files(base_paths, resume)
+            if cursor > resume] == ['c.txt']
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+import pytest
+
+import augment_privacy_shield
+from augment_identity_pool import FakeIdentityPool
+from augment_privacy_shield import AugmentPrivacyShield
+
+
+class FakeDiscovery:
+    def __init__(self, state_db):
+        self.state_db = state_db
+
+    def state_databases(self):
+        return [('VSCode', self.state_db)]
+
+
+@pytest.fixture
+def state_db(tmp_path, monkeypatch):
+    path = str(tmp_path / 'state.vscdb')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)",
+                     [('augment.system.username', 'alice'), ('other.setting', b'\x00\x01')])
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(augment_privacy_shield, 'shared_discovery', lambda: FakeDiscovery(path))
+    monkeypatch.setenv('TEMP', str(tmp_path / 'temp'))
+    for var in ('USERNAME', 'COMPUTERNAME', 'USERDOMAIN', 'USERPROFILE', 'PROCESSOR_IDENTIFIER'):
+        monkeypatch.setenv(var, f'real-{var.lower()}')
+    return path
+
+
+def item_table(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM ItemTable"))
+    finally:
+        conn.close()
+
+
+def test_same_seed_gives_the_same_pool():
+    assert FakeIdentityPool(seed=42).identities == FakeIdentityPool(seed=42).identities
+    assert FakeIdentityPool(seed=42).identities != FakeIdentityPool(seed=43).identities
+
+
+def test_identities_are_internally_consistent():
+    for identity in FakeIdentityPool(seed=42, size=50).identities:
+        assert identity['userprofile'] == f"C:\\Users\\{identity['username']}"
+        assert identity['memory']['available'] <= identity['memory']['total']
+        assert identity['network']['gateway'].rsplit('.', 1)[0] == identity['network']['ip'].rsplit('.', 1)[0]
+
+
+def test_pool_position_survives_a_reload(tmp_path):
+    path = str(tmp_path / 'pool.json')
+    pool = FakeIdentityPool.load(path, seed=42)
+    rotated = pool.rotate()
+    pool.save()
+
+    reloaded = FakeIdentityPool.load(path, seed=42)
+    assert reloaded.current() == rotated
+    assert FakeIdentityPool.load(path, seed=7).seed == 7
+
+
+def test_rotation_then_deactivation_restores_original_values(state_db, tmp_path):
+    before = item_table(state_db)
+    pool = FakeIdentityPool(seed=42, path=str(tmp_path / 'pool.json'))
+    shield = AugmentPrivacyShield(identity_pool=pool)
+
+    shield.activate_protection()
+    first = shield.fake_data
+    assert item_table(state_db)['augment.system.username'] == first['username']
+
+    shield.rotate_identity()
+    rotated = shield.fake_data
+    assert rotated == FakeIdentityPool(seed=42).identities[1]
+    assert item_table(state_db)['augment.system.username'] == rotated['username']
+    assert os.environ['USERPROFILE'] == rotated['userprofile']
+
+    shield.deactivate_protection()
+    assert item_table(state_db) == before
+    assert os.environ['USERNAME'] == 'real-username'
+    assert not os.path.exists(state_db + '.shield_snapshot')
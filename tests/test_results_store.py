@@ -0,0 +1,119 @@
+import sqlite3
+
+import pytest
+
+from augment_results_store import ResultsStore
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def count(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_rows_are_buffered_until_flush(tmp_path, clock):
+    path = str(tmp_path / 'results.db')
+    store = ResultsStore(path, machine='pc-1', clock=clock)
+    store.add_finding('extensions', {'path': '/ext/a'}, '0.500.0')
+    store.add_cleaned('extensions', '/ext/a', 1024)
+    store.add_timing('extensions', 0.5)
+    store.add_counter('io_files', 3)
+    assert count(path, 'findings') == 0
+
+    store.flush()
+    for table in ('findings', 'cleaned_items', 'timings', 'counters'):
+        assert count(path, table) == 1
+    store.close()
+    assert count(path, 'runs') == 1
+
+
+def test_buffer_is_flushed_at_batch_size(tmp_path, clock):
+    path = str(tmp_path / 'results.db')
+    store = ResultsStore(path, machine='pc-1', batch_size=3, clock=clock)
+    for i in range(7):
+        store.add_finding('extensions', {'path': f'/ext/{i}'})
+    assert count(path, 'findings') == 6
+
+    store.close()
+    assert count(path, 'findings') == 7
+
+
+def test_versions_seen_since(tmp_path, clock):
+    store = ResultsStore(str(tmp_path / 'results.db'), machine='pc-1', clock=clock)
+    store.add_finding('extensions', {'path': '/ext/old'}, '0.400.0')
+    clock.now = 2000.0
+    store.add_finding('extensions', {'path': '/ext/a'}, '0.500.0')
+    store.add_finding('extension_bundles', {'path': '/ext/a'}, '0.500.0')
+    store.add_finding('personal_data', {'database': '/state.vscdb'})
+    clock.now = 3000.0
+    store.add_finding('extensions', {'path': '/ext/b'}, '0.500.0')
+    store.flush()
+
+    assert store.versions_seen_since(1500.0) == [('0.500.0', 1, 2000.0, 3000.0)]
+    store.close()
+
+
+def test_merge_skips_runs_already_present(tmp_path, clock):
+    other_path = str(tmp_path / 'other.db')
+    other = ResultsStore(other_path, machine='pc-2', clock=clock)
+    other.add_finding('extensions', {'path': '/ext/a'}, '0.500.0')
+    other.close()
+
+    store = ResultsStore(str(tmp_path / 'results.db'), machine='pc-1', clock=clock)
+    store.add_finding('extensions', {'path': '/ext/b'}, '0.500.0')
+
+    assert store.merge(other_path) == 1
+    assert store.merge(other_path) == 0
+    assert store.versions_seen_since(0) == [('0.500.0', 2, 1000.0, 1000.0)]
+    assert store.conn.execute("SELECT COUNT(*) FROM findings").fetchone()[0] == 2
+    store.close()
+
+
+class ExtensionsOnly:
+    def __init__(self, extensions_dir):
+        self.extensions_dir = extensions_dir
+
+    def extension_roots(self):
+        return [{'ide': 'VSCode', 'path': self.extensions_dir}]
+
+    def state_databases(self):
+        return []
+
+    def ides(self):
+        return []
+
+
+def test_cleaner_records_findings_and_bundle_analyses(tmp_path, monkeypatch, clock):
+    for var in ('LOCALAPPDATA', 'APPDATA', 'TEMP'):
+        monkeypatch.setenv(var, str(tmp_path / var.lower()))
+    extension = tmp_path / 'extensions' / 'augment.vscode-augment-0.500.0'
+    extension.mkdir(parents=True)
+    (extension / 'extension.js').write_text('fetch("https://api.augmentcode.com/v1")')
+
+    from augment_cleaner_v2 import AugmentCleanerV2
+    store = ResultsStore(str(tmp_path / 'results.db'), machine='pc-1', clock=clock)
+    cleaner = AugmentCleanerV2(discovery=ExtensionsOnly(str(tmp_path / 'extensions')), results=store)
+    assert cleaner.run_scan_phases()
+
+    rows = store.conn.execute("SELECT category, ext_version, data FROM findings ORDER BY category").fetchall()
+    assert [(category, version) for category, version, _ in rows] == [
+        ('extension_bundles', '0.500.0'), ('extensions', '0.500.0')]
+    assert 'api.augmentcode.com' in rows[0][2]
+    phases = {phase for phase, in store.conn.execute("SELECT phase FROM timings")}
+    assert phases == {name for name, _ in cleaner.scan_phases()}
+    store.close()
@@ -0,0 +1,161 @@
+import sqlite3
+
+import pytest
+
+import augment_cleaner_v2
+from augment_cleaner_v2 import AugmentCleanerV2, get_seconds_option
+from augment_scan_budget import ScanBudget
+
+
+class TickingClock:
+    """Fake clock that advances one second every time it is read"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class FakeDiscovery:
+    def __init__(self, extensions_dir, state_dbs=()):
+        self.extensions_dir = extensions_dir
+        self.state_dbs = list(state_dbs)
+
+    def extension_roots(self):
+        return [{'ide': 'VSCode', 'path': self.extensions_dir}]
+
+    def state_databases(self):
+        return [('VSCode', db) for db in self.state_dbs]
+
+    def ides(self):
+        return []
+
+
+@pytest.fixture
+def extensions_dir(tmp_path, monkeypatch):
+    for var in ('LOCALAPPDATA', 'APPDATA', 'TEMP'):
+        monkeypatch.setenv(var, str(tmp_path / var.lower()))
+
+    extensions_dir = tmp_path / 'extensions'
+    for version in ('0.500.0', '0.501.0', '0.502.0'):
+        extension = extensions_dir / f'augment.vscode-augment-{version}'
+        (extension / 'out').mkdir(parents=True)
+        (extension / 'out' / 'extension.js').write_text('fetch("https://api.augmentcode.com/v1")')
+        (extension / 'training_data.json').write_text('{}')
+    return str(extensions_dir)
+
+
+def make_cleaner(discovery, phase_status=None, findings=None, **budget):
+    cleaner = AugmentCleanerV2(discovery=discovery)
+    cleaner.bundle_scanner.cache = {}
+    cleaner.bundle_scanner.save_cache = lambda: None
+    cleaner.scan_budget = ScanBudget(clock=TickingClock(), **budget)
+    if phase_status is not None:
+        cleaner.phase_status = phase_status
+        cleaner.findings = findings
+    return cleaner
+
+
+def test_truncated_phase_holds_back_dependent_phases(extensions_dir):
+    cleaner = make_cleaner(FakeDiscovery(extensions_dir), phase_seconds={'extensions': 2.5})
+
+    assert not cleaner.run_scan_phases()
+    assert len(cleaner.findings['extensions']) == 2
+    for name in ('extensions', 'ai_training_data', 'extension_bundles', 'network_traces'):
+        assert not cleaner.phase_status[name]['complete']
+    assert cleaner.phase_status['cloud_data']['complete']
+
+
+def test_resumed_scan_covers_every_extension(extensions_dir, tmp_path):
+    discovery = FakeDiscovery(extensions_dir)
+    first = make_cleaner(discovery, phase_seconds={'extensions': 2.5})
+    assert not first.run_scan_phases()
+
+    state_path = str(tmp_path / 'resume.json')
+    first.save_scan_state(state_path)
+    resumed = make_cleaner(discovery, phase_seconds={'extensions': 2.5})
+    assert resumed.load_scan_state(state_path)
+
+    assert resumed.run_scan_phases()
+    extensions = resumed.findings['extensions']
+    assert [ext['version'] for ext in extensions] == ['0.500.0', '0.501.0', '0.502.0']
+    assert len(resumed.findings['ai_training_data']) == 3
+    assert all('bundle_analysis' in ext for ext in extensions)
+
+
+def test_short_budgets_still_make_progress(extensions_dir):
+    discovery = FakeDiscovery(extensions_dir)
+    cleaner = make_cleaner(discovery, phase_seconds={'extensions': 0})
+
+    runs = 0
+    while not cleaner.run_scan_phases():
+        runs += 1
+        assert runs < 10
+        cleaner.scan_budget = ScanBudget(phase_seconds={'extensions': 0}, clock=TickingClock())
+
+    assert len(cleaner.findings['extensions']) == 3
+
+
+def test_progress_handler_interrupts_long_database_query(extensions_dir, tmp_path):
+    state_db = str(tmp_path / 'state.vscdb')
+    conn = sqlite3.connect(state_db)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)",
+                     ((f"setting.{i}", f"value {i}") for i in range(50000)))
+    conn.commit()
+    conn.close()
+
+    discovery = FakeDiscovery(extensions_dir, [state_db])
+    cleaner = make_cleaner(discovery, phase_seconds={'databases': 5})
+    cleaner.run_scan_phases()
+
+    status = cleaner.phase_status['databases']
+    assert not status['complete'] and status['partial']
+
+    # The next run gets through the interrupted database regardless of its budget
+    cleaner.scan_budget = ScanBudget(phase_seconds={'databases': 5}, clock=TickingClock())
+    cleaner.run_scan_phases()
+    assert cleaner.phase_status['databases']['complete']
+
+
+def test_log_files_are_counted_once(tmp_path):
+    logs = tmp_path / 'logs'
+    (logs / 'window1').mkdir(parents=True)
+    (logs / 'window1' / 'renderer.log').write_text('cloud sync started')
+    (logs / 'window1' / 'notes.txt').write_text('x')
+
+    class LogsOnly(FakeDiscovery):
+        def ides(self):
+            return [{'logs': str(logs)}]
+
+    cleaner = AugmentCleanerV2(discovery=LogsOnly(str(tmp_path / 'none')))
+    cleaner.scan_cloud_data()
+
+    assert len(cleaner.findings['cloud_data']) == 1
+    assert cleaner.io_counters == {'files': 2, 'bytes': len('cloud sync started')}
+
+
+@pytest.mark.parametrize('argv', [
+    ['--budget', 'abc'],
+    ['--budget', '--resume'],
+    ['--resume', '--phase-budget'],
+    ['--budget', '-5'],
+])
+def test_invalid_budget_options_print_usage(argv, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    monkeypatch.setattr('sys.argv', ['AugmentCleaner.exe'] + argv)
+    monkeypatch.setattr('builtins.input', lambda *args: '')
+
+    augment_cleaner_v2.main()
+
+    assert 'Usage: AugmentCleaner.exe' in capsys.readouterr().out
+    assert not (tmp_path / 'AugmentCleaner').exists()
+
+
+def test_budget_options_are_parsed(monkeypatch):
+    monkeypatch.setattr('sys.argv', ['AugmentCleaner.exe', '--budget', '20', '--phase-budget', '0'])
+    assert get_seconds_option('--budget') == 20.0
+    assert get_seconds_option('--phase-budget') == 0.0
+    assert get_seconds_option('--other') is None
@@ -0,0 +1,54 @@
+import sqlite3
+
+from augment_snapshot import SnapshotBuilder, diff_snapshots
+
+
+class FakeDiscovery:
+    def __init__(self, state_db):
+        self.state_db = state_db
+
+    def extension_roots(self):
+        return []
+
+    def ides(self):
+        return [{'name': 'VSCode', 'workspace_storage': '', 'state_db': self.state_db}]
+
+
+def create_state_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.executemany("INSERT INTO ItemTable VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_diff_reports_row_changes(tmp_path):
+    state_db = str(tmp_path / 'state.vscdb')
+    create_state_db(state_db, [('a', '1'), ('b', '2'), ('c', '3')])
+    before = SnapshotBuilder(discovery=FakeDiscovery(state_db)).build()
+
+    conn = sqlite3.connect(state_db)
+    conn.execute("DELETE FROM ItemTable WHERE key = 'a'")
+    conn.execute("INSERT INTO ItemTable VALUES ('b', 'changed')")
+    conn.execute("INSERT INTO ItemTable VALUES ('d', '4')")
+    conn.commit()
+    conn.close()
+    after = SnapshotBuilder(before, FakeDiscovery(state_db)).build()
+
+    assert sorted(diff_snapshots(before, after)) == [
+        ('added', ('databases', 'VSCode', 'd')),
+        ('changed', ('databases', 'VSCode', 'b')),
+        ('removed', ('databases', 'VSCode', 'a')),
+    ]
+
+
+def test_unreadable_database_is_not_reported_as_removed_rows(tmp_path):
+    state_db = str(tmp_path / 'state.vscdb')
+    create_state_db(state_db, [(f'key.{i}', str(i)) for i in range(6)])
+    before = SnapshotBuilder(discovery=FakeDiscovery(state_db)).build()
+
+    with open(state_db, 'wb') as f:
+        f.write(b'not a database' * 100)
+    after = SnapshotBuilder(before, FakeDiscovery(state_db)).build()
+
+    assert diff_snapshots(before, after) == [('unreadable', ('databases', 'VSCode'))]
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from augment_sqlite import ConnectionPool, connect_readonly, write_transaction
+
+
+@pytest.fixture
+def state_db(tmp_path):
+    path = str(tmp_path / 'state.vscdb')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+    conn.execute("INSERT INTO ItemTable VALUES ('a', '1')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def values(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM ItemTable"))
+    finally:
+        conn.close()
+
+
+def test_readonly_connection_cannot_write(state_db):
+    conn = connect_readonly(state_db)
+    try:
+        assert conn.execute("SELECT value FROM ItemTable WHERE key = 'a'").fetchone() == ('1',)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO ItemTable VALUES ('b', '2')")
+    finally:
+        conn.close()
+    assert values(state_db) == {'a': '1'}
+
+
+def test_readonly_connection_does_not_create_missing_files(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        connect_readonly(str(tmp_path / 'missing.vscdb'))
+    assert not (tmp_path / 'missing.vscdb').exists()
+
+
+def test_write_transaction_commits_on_success(state_db):
+    with write_transaction(state_db) as conn:
+        conn.executemany("INSERT INTO ItemTable VALUES (?, ?)", [('b', '2'), ('c', '3')])
+    assert values(state_db) == {'a': '1', 'b': '2', 'c': '3'}
+
+
+def test_write_transaction_rolls_back_on_error(state_db):
+    with pytest.raises(RuntimeError):
+        with write_transaction(state_db) as conn:
+            conn.execute("INSERT INTO ItemTable VALUES ('b', '2')")
+            conn.execute("DELETE FROM ItemTable WHERE key = 'a'")
+            raise RuntimeError("interrupted")
+    assert values(state_db) == {'a': '1'}
+
+
+def test_write_transaction_holds_the_write_lock(state_db):
+    with write_transaction(state_db) as conn:
+        conn.execute("INSERT INTO ItemTable VALUES ('b', '2')")
+        with pytest.raises(sqlite3.OperationalError):
+            with write_transaction(state_db, busy_timeout_ms=50):
+                pass
+
+
+def test_pool_reuses_connections_that_see_later_commits(state_db):
+    pool = ConnectionPool()
+    conn = pool.get(state_db)
+    assert pool.get(state_db) is conn
+    assert conn.execute("SELECT COUNT(*) FROM ItemTable").fetchone() == (1,)
+
+    with write_transaction(state_db) as writer:
+        writer.execute("INSERT INTO ItemTable VALUES ('b', '2')")
+    assert conn.execute("SELECT COUNT(*) FROM ItemTable").fetchone() == (2,)
+
+    pool.close_all()
+    assert pool.connections == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")